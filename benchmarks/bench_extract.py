@@ -0,0 +1,110 @@
+"""
+Micro-benchmark for the login form and tariff extraction.
+
+Compares custom_components/jemenaoutlook/extract.py with the BeautifulSoup
+code it replaced. Saved portal pages can be passed in place of the bundled
+fixtures:
+
+    python benchmarks/bench_extract.py [--login PAGE] [--index PAGE] [-n 200]
+
+BeautifulSoup is only needed to run the comparison, the integration itself
+no longer depends on it.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import re
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+EXTRACT_PY = os.path.join(
+    HERE, os.pardir, "custom_components", "jemenaoutlook", "extract.py"
+)
+
+
+def load_extract():
+    # Loaded by path so the benchmark does not need Home Assistant installed.
+    spec = importlib.util.spec_from_file_location("jemenaoutlook_extract", EXTRACT_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bs4_form_action(content):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    form_node = soup.find("form", {"id": "loginForm"})
+    return form_node.attrs.get("action")
+
+
+def bs4_tariff_json(content):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    tariff_script = soup.find("script", text=re.compile("var tariff = "))
+    return re.search(
+        r"^\s*var tariff =\s*({.*?})\s*;\s*$",
+        tariff_script.string,
+        flags=re.DOTALL | re.MULTILINE,
+    ).group(1)
+
+
+def bench(func, content, number):
+    best = min(timeit.repeat(lambda: func(content), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--login", default=os.path.join(FIXTURES, "login_index.html"))
+    parser.add_argument(
+        "--index", default=os.path.join(FIXTURES, "electricityview_index.html")
+    )
+    parser.add_argument("-n", "--number", type=int, default=200)
+    args = parser.parse_args()
+
+    extract = load_extract()
+    with open(args.login, "rb") as f:
+        login_page = f.read()
+    with open(args.index, "rb") as f:
+        index_page = f.read()
+
+    cases = [
+        (
+            "login_form_action",
+            login_page,
+            lambda c: extract.find_form_action(c, "loginForm")[1],
+            bs4_form_action,
+        ),
+        ("tariff_json", index_page, extract.find_tariff_json, bs4_tariff_json),
+    ]
+
+    try:
+        import bs4  # noqa: F401
+
+        have_bs4 = True
+    except ImportError:
+        have_bs4 = False
+
+    results = []
+    for name, content, fast, slow in cases:
+        result = {
+            "case": name,
+            "bytes": len(content),
+            "extract_us": round(bench(fast, content, args.number), 2),
+        }
+        if have_bs4:
+            if fast(content) != slow(content):
+                raise SystemExit("{}: extract and bs4 results differ".format(name))
+            result["bs4_us"] = round(bench(slow, content, args.number), 2)
+            result["speedup"] = round(result["bs4_us"] / result["extract_us"], 1)
+        results.append(result)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
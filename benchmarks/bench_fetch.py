@@ -0,0 +1,261 @@
+"""
+Offline benchmark of a full Jemena Outlook refresh.
+
+Runs JemenaOutlookClient against the fake portal in fake_portal.py, which
+replays the bundled fixtures with a configurable delay and error rate per
+request, and reports for each scenario the refresh latency, the requests and
+retries it made and the peak memory allocated while it ran, plus the time
+spent in each stage and the time and peak memory of decoding each period
+view, read whole into ``json.loads`` and selectively as it arrives, as the
+client does:
+
+    python benchmarks/bench_fetch.py [-n 20] [--latency 0.2] [--jitter 0.05]
+                                     [--error-rate 0.1] [--output results.json]
+
+Scenarios are ``cold`` (new session, logs in first), ``warm`` (logged in,
+empty response cache) and ``cached`` (logged in, cache kept from the
+previous refresh). Results are printed as JSON. The client is imported from
+the integration's package, which imports Home Assistant, so Home Assistant
+has to be installed as well as aiohttp and NumPy.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir))
+
+from custom_components.jemenaoutlook.client import (  # noqa: E402
+    PERIOD_VIEW_FIELDS,
+    JemenaOutlookClient,
+    JemenaOutlookError,
+)
+from custom_components.jemenaoutlook.const import RESPONSE_CHUNK_SIZE  # noqa: E402
+from custom_components.jemenaoutlook.jsonstream import decode_stream  # noqa: E402
+from fake_portal import FakePortal  # noqa: E402
+
+USERNAME = "bench@example.com"
+PASSWORD = "bench"
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+    return {
+        "median_ms": round(statistics.median(samples) * 1e3, 2),
+        "p95_ms": round(p95 * 1e3, 2),
+        "min_ms": round(samples[0] * 1e3, 2),
+        "max_ms": round(samples[-1] * 1e3, 2),
+    }
+
+
+def new_session():
+    # The fake portal runs on an IP address, whose cookies the default jar drops.
+    return aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True))
+
+
+async def timed(portal, coro_factory):
+    """Run one coroutine, returns its duration, requests, peak memory, success."""
+    portal.reset_counters()
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        await coro_factory()
+        succeeded = True
+    except JemenaOutlookError:
+        succeeded = False
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - start_memory
+    return elapsed, portal.total_requests, peak, succeeded
+
+
+async def bench_scenario(portal, host, scenario, number):
+    durations = []
+    requests = []
+    retries = 0
+    failures = 0
+    peaks = []
+
+    async with new_session() as session:
+        client = JemenaOutlookClient(session, USERNAME, PASSWORD, host=host)
+        await timed(portal, client.fetch_data)
+
+        for _ in range(number):
+            if scenario == "cold":
+                session.cookie_jar.clear()
+                client = JemenaOutlookClient(session, USERNAME, PASSWORD, host=host)
+            elif scenario == "warm":
+                client.cache.clear()
+
+            elapsed, count, peak, succeeded = await timed(portal, client.fetch_data)
+            durations.append(elapsed)
+            requests.append(count)
+            retries += client.metrics.refresh_retries
+            failures += not succeeded
+            peaks.append(peak)
+
+    result = {"scenario": scenario, "runs": number}
+    result.update(summarize(durations))
+    result["requests_per_refresh"] = max(requests)
+    result["retries"] = retries
+    result["failures"] = failures
+    result["peak_memory_kib"] = round(max(peaks) / 1024, 1)
+    return result
+
+
+async def bench_stages(portal, host, number):
+    """Time each stage of a refresh on its own, logged in with an empty cache."""
+    async with new_session() as session:
+        client = JemenaOutlookClient(session, USERNAME, PASSWORD, host=host)
+        stages = {
+            "login": client._login,
+            "tariffs": client._get_tariffs,
+            "day": lambda: client._get_period("day", 1),
+            "week": lambda: client._get_period("week", 0),
+            "month": lambda: client._get_period("month", 0),
+        }
+        await client._login()
+
+        results = []
+        for name, stage in stages.items():
+            durations = []
+            for _ in range(number):
+                client.cache.clear()
+                elapsed, _, _, _ = await timed(portal, stage)
+                durations.append(elapsed)
+            result = {"stage": name}
+            result.update(summarize(durations))
+            results.append(result)
+        return results
+
+
+async def read_chunks(path):
+    """Yield a file's bytes in chunks, as the client receives a response."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(RESPONSE_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def load_whole(path):
+    body = b"".join([chunk async for chunk in read_chunks(path)])
+    return json.loads(body)
+
+
+def write_scaled_view(path, factor, directory):
+    """Write a period view with every series ``factor`` times as long.
+
+    It stands for views of many more intervals than the fixtures, such as
+    long ranges, whose chart options carry the consumption series too.
+    """
+    with open(path, "rb") as f:
+        view = json.load(f)
+    for period in ("selectedPeriod", "comparisonPeriod"):
+        for data in ("consumptionData", "costData"):
+            series = view[period][data]
+            for key in series:
+                series[key] = series[key] * factor
+        view[period]["subPeriodLabels"] = view[period]["subPeriodLabels"] * factor
+    view["chartOptions"]["series"] = list(
+        view["selectedPeriod"]["consumptionData"].values()
+    )
+
+    scaled = os.path.join(directory, "x{}_{}".format(factor, os.path.basename(path)))
+    with open(scaled, "w") as f:
+        json.dump(view, f)
+    return scaled
+
+
+async def bench_decode(number):
+    """Decode each period view fixture whole and selectively as it arrives."""
+    decoders = {
+        "json.loads": load_whole,
+        "decode_stream": lambda path: decode_stream(
+            read_chunks(path), PERIOD_VIEW_FIELDS
+        ),
+    }
+    views = {
+        view: os.path.join(HERE, "fixtures", "period_{}.json".format(view))
+        for view in ("day", "week", "month", "season")
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        views["month_x20"] = write_scaled_view(views["month"], 20, directory)
+        return await _bench_decoders(decoders, views, number)
+
+
+async def _bench_decoders(decoders, views, number):
+    results = []
+    for view, path in views.items():
+        for name, decode in decoders.items():
+            durations = []
+            peak = 0
+            for _ in range(number):
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                decoded = await decode(path)
+                durations.append(time.perf_counter() - start)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - start_memory)
+                del decoded
+            result = {"view": view, "decoder": name, "bytes": os.path.getsize(path)}
+            result.update(summarize(durations))
+            result["peak_memory_kib"] = round(peak / 1024, 1)
+            results.append(result)
+    return results
+
+
+async def run(args):
+    portal = FakePortal(args.latency, args.jitter, args.error_rate)
+    runner, host = await portal.start()
+    tracemalloc.start()
+    try:
+        scenarios = [
+            await bench_scenario(portal, host, scenario, args.number)
+            for scenario in ("cold", "warm", "cached")
+        ]
+        stages = await bench_stages(portal, host, args.number)
+        decoding = await bench_decode(args.number)
+    finally:
+        tracemalloc.stop()
+        await runner.cleanup()
+
+    return {
+        "latency_s": args.latency,
+        "jitter_s": args.jitter,
+        "error_rate": args.error_rate,
+        "scenarios": scenarios,
+        "stages": stages,
+        "decoding": decoding,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--number", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Offline stand-in for the Jemena Electricity Outlook portal.
+
+Replays the pages and period views in benchmarks/fixtures with the same
+login flow as the real site: the login form sets a session cookie, and
+pages requested without it redirect back to the login page. Every response
+can be delayed by a fixed latency plus random jitter, a share of them can
+fail with 503 Service Unavailable, and requests are counted per path so a
+client's request pattern can be checked.
+
+    python benchmarks/fake_portal.py [--port 8080] [--latency 0.2] [--jitter 0.05]
+                                     [--error-rate 0.1]
+
+Point a client at it with ``host="http://127.0.0.1:8080"``. Cookies from an
+IP address host are only kept by an ``aiohttp.CookieJar(unsafe=True)``.
+"""
+import argparse
+import asyncio
+from collections import Counter
+import hashlib
+import os
+import random
+
+from aiohttp import hdrs, web
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+
+SESSION_COOKIE = "JSESSIONID"
+
+
+class FakePortal(object):
+    """The fake portal's pages, delays and request counters."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, fixtures=FIXTURES):
+        """Load the fixtures, responses wait ``latency`` +- ``jitter`` seconds.
+
+        An ``error_rate`` share of the requests fail with a 503.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = Counter()
+        self.logins = 0
+        self._session_id = None
+        self._pages = {}
+        for name in os.listdir(fixtures):
+            with open(os.path.join(fixtures, name), "rb") as f:
+                self._pages[name] = f.read()
+
+    def reset_counters(self):
+        self.requests.clear()
+        self.logins = 0
+
+    def expire_sessions(self):
+        """Make the portal forget every login, as after a session timeout."""
+        self._session_id = None
+
+    @property
+    def total_requests(self):
+        return sum(self.requests.values())
+
+    async def _delay(self):
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _logged_in(self, request):
+        session_id = request.cookies.get(SESSION_COOKIE)
+        return session_id is not None and session_id == self._session_id
+
+    def _page(self, request, name, content_type):
+        body = self._pages[name]
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest()[:16])
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        return web.Response(
+            body=body, content_type=content_type, headers={hdrs.ETAG: etag}
+        )
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        self.requests[request.path] += 1
+        await self._delay()
+        if self.error_rate and random.random() < self.error_rate:
+            raise web.HTTPServiceUnavailable()
+        return await handler(request)
+
+    async def _login_index(self, request):
+        return self._page(request, "login_index.html", "text/html")
+
+    async def _login_security_check(self, request):
+        form = await request.post()
+        if not form.get("login_email") or not form.get("login_password"):
+            raise web.HTTPFound("/login/index")
+
+        self.logins += 1
+        self._session_id = os.urandom(8).hex()
+        response = web.HTTPFound("/electricityView/index")
+        response.set_cookie(SESSION_COOKIE, self._session_id)
+        raise response
+
+    async def _electricity_view_index(self, request):
+        if not self._logged_in(request):
+            raise web.HTTPFound("/login/index")
+        return self._page(request, "electricityview_index.html", "text/html")
+
+    async def _electricity_view_period(self, request):
+        if not self._logged_in(request):
+            raise web.HTTPFound("/login/index")
+        name = "period_{}.json".format(request.match_info["granularity"])
+        if name not in self._pages:
+            raise web.HTTPNotFound()
+        return self._page(request, name, "application/json")
+
+    def make_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/login/index", self._login_index)
+        app.router.add_post("/login_security_check", self._login_security_check)
+        app.router.add_get("/electricityView/index", self._electricity_view_index)
+        app.router.add_get(
+            "/electricityView/period/{granularity}/{offset}",
+            self._electricity_view_period,
+        )
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Serve the portal, returns the runner and the base url."""
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        port = runner.addresses[0][1]
+        return runner, "http://{}:{}".format(host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    portal = FakePortal(args.latency, args.jitter, args.error_rate)
+    web.run_app(portal.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,107 @@
 """The Jemena Outlook integration."""
+from datetime import timedelta
+
+from homeassistant.const import CONF_NAME, CONF_PASSWORD, CONF_USERNAME, Platform
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import (
+    CONF_PERIODS,
+    CONF_POLL_WINDOW,
+    CONF_ROLLING_WINDOWS,
+    DATA_FLOW_SESSIONS,
+    DEFAULT_POLL_WINDOW,
+    DEFAULT_ROLLING_WINDOWS,
+    DOMAIN,
+    ENDPOINT_TARIFFS,
+    PERIODS,
+)
+from .coordinator import JemenaOutlookData, cookie_file_path, first_refresh_delay
+from .services import async_register_services
+
+PLATFORMS = [Platform.SENSOR]
+
+
+def _entry_endpoints(entry):
+    return frozenset(
+        (ENDPOINT_TARIFFS,) + tuple(entry.options.get(CONF_PERIODS, PERIODS))
+    )
+
+
+def _entry_poll_window(entry):
+    return timedelta(hours=entry.options.get(CONF_POLL_WINDOW, DEFAULT_POLL_WINDOW))
+
+
+def _entry_rolling_windows(entry):
+    # Stored as strings, the keys of the options form's multi select.
+    return tuple(
+        sorted(
+            int(days)
+            for days in entry.options.get(CONF_ROLLING_WINDOWS, DEFAULT_ROLLING_WINDOWS)
+        )
+    )
+
+
+async def async_setup_entry(hass, entry):
+    """Set up an account added through the UI."""
+    username = entry.data[CONF_USERNAME]
+    name = entry.data[CONF_NAME]
+
+    # Right after the config flow, its logged in session is taken over so
+    # the first refresh does not log in again.
+    session = hass.data.get(DATA_FLOW_SESSIONS, {}).pop(username, None)
+    if session is None:
+        session = async_create_clientsession(hass)
+    # Each setup gets its own session, which goes with the entry; the shared
+    # connector stays open for the next setup.
+    entry.async_on_unload(session.detach)
+
+    coordinators = hass.data.setdefault(DOMAIN, {})
+    jemenaoutlook_data = JemenaOutlookData(
+        hass,
+        session,
+        username,
+        entry.data[CONF_PASSWORD],
+        name,
+        cookie_file_path(hass, username),
+        _entry_endpoints(entry),
+        poll_window=_entry_poll_window(entry),
+        rolling_windows=_entry_rolling_windows(entry),
+    )
+    await jemenaoutlook_data.client.async_load_session()
+    entry.async_on_unload(
+        jemenaoutlook_data.async_schedule_first_refresh(
+            first_refresh_delay(len(coordinators))
+        )
+    )
+    coordinators[name] = jemenaoutlook_data
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_register_services(hass)
+    return True
+
+
+async def async_unload_entry(hass, entry):
+    """Unload an account added through the UI."""
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded:
+        hass.data[DOMAIN].pop(entry.data[CONF_NAME])
+    return unloaded
+
+
+async def _async_update_listener(hass, entry):
+    """Apply changed options.
+
+    The poll window changes in place; enabling or disabling a period or a
+    rolling window changes which sensors exist, so the entry is reloaded for
+    that.
+    """
+    jemenaoutlook_data = hass.data[DOMAIN][entry.data[CONF_NAME]]
+    if (
+        _entry_endpoints(entry) != jemenaoutlook_data.client.endpoints
+        or _entry_rolling_windows(entry) != jemenaoutlook_data.rolling_windows
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    jemenaoutlook_data.async_set_poll_window(_entry_poll_window(entry))
@@ -0,0 +1,88 @@
+"""
+Aggregation of a period view's interval arrays.
+
+The selected period's consumption and cost series and the comparison
+period's consumption series are loaded into a single NumPy array, one row
+per series with NaN for missing readings, and reduced together.
+"""
+import numpy as np
+
+from .const import CONSUMPTION_KEYS, COST_KEYS
+
+# The first four consumption series make up usage; generation and
+# suburbAverage are kept apart.
+_USAGE_ROWS = slice(0, 4)
+_COST_OFFSET = len(CONSUMPTION_KEYS)
+_COMPARISON_OFFSET = _COST_OFFSET + len(COST_KEYS)
+
+
+def _interval_matrix(selected, comparison):
+    series = [selected["consumptionData"][key] for key in CONSUMPTION_KEYS]
+    series += [selected["costData"][key] for key in COST_KEYS]
+    series += [comparison["consumptionData"][key] for key in CONSUMPTION_KEYS]
+
+    # The compared periods need not be the same length, e.g. 31 and 30 days.
+    matrix = np.full((len(series), max(len(s) for s in series)), np.nan)
+    for row, values in enumerate(series):
+        matrix[row, : len(values)] = values
+    return matrix
+
+
+def aggregate_period(json_data, day_view=False):
+    """Reduce a period view to its channel sums and interval statistics.
+
+    Returns a dict with the rounded sums of every consumption and cost
+    series of the selected period (``consumption``, ``cost``), the
+    comparison period's consumption sums (``comparison``), and for the
+    selected period's usage per interval its largest value (``max_interval``),
+    ``load_factor`` (mean over max) and, for a ``day_view`` of 24 hours, the
+    usage per hour of the day (``hourly_profile``).
+    """
+    matrix = _interval_matrix(
+        json_data["selectedPeriod"], json_data["comparisonPeriod"]
+    )
+    sums = np.nansum(matrix, axis=1).tolist()
+
+    consumption = {key: round(sums[row], 3) for row, key in enumerate(CONSUMPTION_KEYS)}
+    cost = {
+        key: round(sums[_COST_OFFSET + row], 2) for row, key in enumerate(COST_KEYS)
+    }
+    comparison = {
+        key: round(sums[_COMPARISON_OFFSET + row], 3)
+        for row, key in enumerate(CONSUMPTION_KEYS)
+    }
+
+    selected_length = len(json_data["selectedPeriod"]["consumptionData"]["peak"])
+    usage_rows = matrix[_USAGE_ROWS, :selected_length]
+    usage = np.nansum(usage_rows, axis=0)
+    usage[np.all(np.isnan(usage_rows), axis=0)] = np.nan
+
+    max_interval = None
+    load_factor = None
+    if not np.all(np.isnan(usage)):
+        max_interval = float(np.nanmax(usage))
+        if max_interval > 0:
+            load_factor = round(float(np.nanmean(usage)) / max_interval, 3)
+        max_interval = round(max_interval, 3)
+
+    # Longer views can have a multiple of 24 intervals too, but those are
+    # days or weeks, not parts of an hour. Days of 23 or 25 hours at daylight
+    # saving changes have no profile.
+    hourly_profile = None
+    if day_view and selected_length and selected_length % 24 == 0:
+        intervals_per_hour = selected_length // 24
+        hourly_profile = [
+            round(value, 3)
+            for value in np.nansum(
+                usage.reshape(-1, intervals_per_hour), axis=1
+            ).tolist()
+        ]
+
+    return {
+        "consumption": consumption,
+        "cost": cost,
+        "comparison": comparison,
+        "max_interval": max_interval,
+        "load_factor": load_factor,
+        "hourly_profile": hourly_profile,
+    }
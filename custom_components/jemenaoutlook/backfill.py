@@ -0,0 +1,81 @@
+"""Backfill historical daily interval data from the Jemena Outlook portal."""
+import asyncio
+from datetime import timedelta
+import logging
+
+from .client import JemenaOutlookError, portal_today
+from .const import ENDPOINT_DAY
+from .statistics import async_import_days
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JemenaOutlookBackfill(object):
+    """Walk the day view back in time and import it into statistics.
+
+    Fetched days land in the account's interval store, so an interrupted run
+    picks up where it stopped and only requests the days it is missing.
+    """
+
+    def __init__(self, hass, coordinator):
+        """Initialize the backfill for one account."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._lock = asyncio.Lock()
+
+    async def async_run(self, days, concurrency, rate):
+        """Fetch the last ``days`` days and import them into statistics."""
+        client = self.coordinator.client
+        store = client.store
+
+        async with self._lock:
+            today = portal_today()
+            covered = await store.async_stored_days(client.username)
+
+            # Each day view also carries the day before as its comparison
+            # period, so a gap of two missing days only needs one request.
+            pending = []
+            for days_ago in range(1, days + 1):
+                day = today - timedelta(days=days_ago)
+                if day in covered:
+                    continue
+                pending.append(days_ago)
+                covered.update((day, day - timedelta(days=1)))
+            _LOGGER.info(
+                "Backfilling %d of the last %d days for %s",
+                len(pending),
+                days,
+                self.coordinator.name,
+            )
+
+            # Fetched days are stored as they arrive, only failures are kept.
+            failed = []
+            async for _, _, result in client.iter_period_json(
+                ((ENDPOINT_DAY, days_ago) for days_ago in pending),
+                concurrency,
+                rate,
+                return_exceptions=True,
+            ):
+                if isinstance(result, JemenaOutlookError):
+                    failed.append(result)
+
+            if failed:
+                _LOGGER.warning(
+                    "Backfill for %s missed %d days, run it again to resume: %s",
+                    self.coordinator.name,
+                    len(failed),
+                    failed[0],
+                )
+
+            days = await store.async_get_days(client.username)
+            await async_import_days(
+                self.hass,
+                client.username,
+                self.coordinator.name,
+                {day: period["consumptionData"] for day, (period, _) in days.items()},
+            )
+
+            # The windows only ever take days newer than their latest one.
+            if self.coordinator.windows is not None:
+                await self.coordinator.async_update_windows(rebuild=True)
+                self.coordinator.async_update_listeners()
@@ -0,0 +1,90 @@
+"""In-memory response cache for Jemena Outlook portal requests."""
+from collections import OrderedDict
+import time
+
+from aiohttp import hdrs
+
+
+class CacheEntry(object):
+    __slots__ = ("body", "etag", "last_modified", "expires")
+
+    def __init__(self, body, etag, last_modified, expires):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    def is_fresh(self, now):
+        return self.expires is None or now < self.expires
+
+    def conditional_headers(self):
+        """Return the headers to revalidate this entry with the portal."""
+        headers = {}
+        if self.etag is not None:
+            headers[hdrs.IF_NONE_MATCH] = self.etag
+        if self.last_modified is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = self.last_modified
+        return headers
+
+
+class ResponseCache(object):
+    """Response bodies by url, each kept for a caller chosen ttl.
+
+    A ttl of None keeps the body until it is evicted, 0 disables caching.
+    Expired bodies that came with an ETag or Last-Modified header are kept
+    so the next request can be made conditional. At most ``max_entries``
+    bodies are kept, least recently used first out.
+    """
+
+    def __init__(self, max_entries=128):
+        """Initialize an empty cache."""
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def lookup(self, url):
+        """Return ``(entry, fresh)`` for a url, entry is None on a miss."""
+        entry = self._entries.get(url)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(url)
+        if entry.is_fresh(time.monotonic()):
+            self.hits += 1
+            return entry, True
+
+        self.misses += 1
+        return entry, False
+
+    def store(self, url, body, headers, ttl):
+        """Keep a 200 response body for ``ttl`` seconds."""
+        etag = headers.get(hdrs.ETAG)
+        last_modified = headers.get(hdrs.LAST_MODIFIED)
+        if ttl == 0 and etag is None and last_modified is None:
+            self._entries.pop(url, None)
+            return
+
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._entries[url] = CacheEntry(body, etag, last_modified, expires)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def revalidated(self, url, headers, ttl):
+        """Extend an entry after the portal answered 304 Not Modified."""
+        entry = self._entries[url]
+        self.revalidations += 1
+        entry.etag = headers.get(hdrs.ETAG, entry.etag)
+        entry.last_modified = headers.get(hdrs.LAST_MODIFIED, entry.last_modified)
+        entry.expires = None if ttl is None else time.monotonic() + ttl
+        return entry.body
+
+    def discard(self, url):
+        """Forget a body that turned out to be unusable."""
+        self._entries.pop(url, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,718 @@
+"""
+Async client for the Jemena Electricity Outlook website.
+https://electricityoutlook.jemena.com.au/electricityView/index
+"""
+import asyncio
+from datetime import datetime, timedelta
+import itertools
+import json
+import locale
+import logging
+import os
+from zoneinfo import ZoneInfo
+
+import aiohttp
+
+from .const import (
+    BREAKER_MAX_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_THRESHOLD,
+    CACHE_CURRENT_PERIOD,
+    CACHE_PAST_PERIOD,
+    CACHE_TARIFFS,
+    DEFAULT_CACHE_TTLS,
+    ENDPOINT_DAY,
+    ENDPOINT_MONTH,
+    ENDPOINT_TARIFFS,
+    ENDPOINT_WEEK,
+    ENDPOINTS,
+    GRANULARITIES,
+    HOME_PATH,
+    HOST,
+    INDEX_PATH,
+    LOGIN_PATH,
+    LOGIN_PATH_PREFIX,
+    PERIOD_PATH,
+    PERIOD_PREFIXES,
+    PORTAL_TIMEZONE,
+    REQUESTS_TIMEOUT,
+    RESPONSE_CHUNK_SIZE,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    TARIFF_SENSORS,
+)
+from .cache import ResponseCache
+from .extract import find_form_action, find_tariff_json
+from .jsonstream import decode_stream
+from .models import OutlookData, PeriodRecord, TariffRecord
+from .metrics import (
+    STAGE_DAY,
+    STAGE_LOGIN,
+    STAGE_MONTH,
+    STAGE_TARIFFS,
+    STAGE_WEEK,
+    FetchMetrics,
+)
+from .retry import CircuitBreaker, RateLimiter, RetryPolicy
+from .singleflight import SingleFlight
+from .store import DIFFERENCE_KEYS, is_complete
+from .tracing import Tracer
+
+_LOGGER = logging.getLogger(__name__)
+
+# The members of a period view that are read. Chart options, labels and the
+# rest of the payload are stepped over as they arrive, see ``jsonstream``.
+_PERIOD_FIELDS = dict.fromkeys(
+    (
+        "netConsumption",
+        "averageNetConsumptionPerSubPeriod",
+        "consumptionData",
+        "costData",
+    )
+)
+PERIOD_VIEW_FIELDS = {
+    "selectedPeriod": _PERIOD_FIELDS,
+    "comparisonPeriod": _PERIOD_FIELDS,
+    **dict.fromkeys(DIFFERENCE_KEYS),
+}
+
+
+class JemenaOutlookError(Exception):
+    pass
+
+
+class JemenaOutlookSessionExpired(JemenaOutlookError):
+    """The portal no longer accepts the session cookies."""
+
+
+class JemenaOutlookAuthError(JemenaOutlookError):
+    """The portal rejected the username or password."""
+
+
+class JemenaOutlookUnavailable(JemenaOutlookError):
+    """The portal could not be reached or failed to answer, worth retrying."""
+
+
+class JemenaOutlookCircuitOpen(JemenaOutlookError):
+    """Calls are held back after the portal failed repeatedly."""
+
+
+def portal_today():
+    """Return today's date as the portal sees it."""
+    return datetime.now(ZoneInfo(PORTAL_TIMEZONE)).date()
+
+
+def required_endpoints(sensor_types):
+    """Return the portal endpoints needed to fill the given sensor keys."""
+    endpoints = set()
+    for sensor_type in sensor_types:
+        if sensor_type in TARIFF_SENSORS:
+            endpoints.add(ENDPOINT_TARIFFS)
+            continue
+        for endpoint, prefixes in PERIOD_PREFIXES.items():
+            if sensor_type.startswith(prefixes):
+                endpoints.add(endpoint)
+                break
+    return endpoints
+
+
+class _ReceivedChunks(object):
+    """The chunks of a response body, counting its size as they are read.
+
+    The first ``head_bytes`` bytes are kept for tracing.
+    """
+
+    def __init__(self, content, chunk_size, head_bytes=0):
+        self._chunks = content.iter_chunked(chunk_size)
+        self._head_bytes = head_bytes
+        self.head = b""
+        self.size = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        chunk = await self._chunks.__anext__()
+        self.size += len(chunk)
+        if len(self.head) < self._head_bytes:
+            self.head += chunk[: self._head_bytes - len(self.head)]
+        return chunk
+
+
+class JemenaOutlookClient(object):
+    def __init__(
+        self,
+        session,
+        username,
+        password,
+        timeout=REQUESTS_TIMEOUT,
+        cookie_file=None,
+        endpoints=ENDPOINTS,
+        store=None,
+        cache_ttls=None,
+        host=HOST,
+    ):
+        """Initialize the client object.
+
+        ``session`` is an ``aiohttp.ClientSession`` owned by the caller. It is
+        kept for the lifetime of the client so connections and login cookies
+        are reused between requests and refreshes. When ``cookie_file`` is
+        given the cookies are also saved there after each login so they
+        survive a restart. Only the requests listed in ``endpoints`` are made
+        on each refresh, see ``required_endpoints``. Days kept in the
+        ``IntervalStore`` given as ``store`` are read from it instead of
+        being downloaded again. Responses are cached for the seconds given
+        per kind of page in ``cache_ttls``, see ``DEFAULT_CACHE_TTLS``. The
+        cost of each refresh is recorded in ``metrics``, and responses are
+        logged while ``tracer`` is enabled. Stages that fail transiently are
+        retried following ``retry_policy``, and ``breaker`` stops all calls
+        while the portal is down.
+        ``host`` only needs changing to talk to a stand-in for the portal.
+        """
+        self.username = username
+        self.password = password
+        self._data = OutlookData()
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = session
+        self._host = host
+        self._cookie_file = cookie_file
+        self._logged_in = False
+        self._login_lock = asyncio.Lock()
+        self._login_count = 0
+        self._refresh = SingleFlight()
+        self._endpoints = frozenset(endpoints)
+        self.store = store
+        self.cache = ResponseCache()
+        self.metrics = FetchMetrics()
+        self.tracer = Tracer(username)
+        self.retry_policy = RetryPolicy(
+            RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+        )
+        self.breaker = CircuitBreaker(
+            BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT, BREAKER_MAX_RESET_TIMEOUT
+        )
+        self._cache_ttls = dict(DEFAULT_CACHE_TTLS)
+        self._cache_ttls.update(cache_ttls or {})
+
+    @property
+    def endpoints(self):
+        return self._endpoints
+
+    async def async_load_session(self):
+        """Restore the cookies saved by a previous login, if any.
+
+        A session that already holds cookies, such as one the config flow
+        has just logged in, is used as it is.
+        """
+        jar = self._session.cookie_jar
+        if self._cookie_file is not None and len(jar) == 0:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, jar.load, self._cookie_file)
+            except FileNotFoundError:
+                return
+            except (OSError, EOFError, ValueError) as e:
+                _LOGGER.warning("Ignoring unreadable Jemena outlook cookies: %s", e)
+                return
+
+        # Assume the session is still valid; the first request will tell.
+        self._logged_in = len(jar) > 0
+
+    async def _save_session(self):
+        """Persist the current cookies so the next start can skip the login."""
+        if self._cookie_file is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._write_cookie_file)
+        except OSError as e:
+            _LOGGER.warning("Could not save Jemena outlook cookies: %s", e)
+
+    def _write_cookie_file(self):
+        os.makedirs(os.path.dirname(self._cookie_file), exist_ok=True)
+        self._session.cookie_jar.save(self._cookie_file)
+
+    def _check_session(self, raw_res):
+        """Raise if the portal bounced the request to the login page."""
+        if raw_res.url.path.startswith(LOGIN_PATH_PREFIX):
+            self.metrics.record_response(raw_res.status, 0)
+            if self.tracer.enabled:
+                self.tracer.response("GET", raw_res.url, raw_res.status)
+            self._logged_in = False
+            raise JemenaOutlookSessionExpired(
+                "Redirected to login from {}".format(raw_res.request_info.url)
+            )
+
+    async def _login(self):
+        """Start a new portal session, discarding any stale cookies."""
+        self._logged_in = False
+        self._session.cookie_jar.clear()
+
+        with self.metrics.stage(STAGE_LOGIN):
+            # Get login page
+            login_url = await self._retrying(self._get_login_page)
+
+            # Post login page
+            await self._retrying(lambda: self._post_login_page(login_url))
+
+        self._logged_in = True
+        self._login_count += 1
+        self.metrics.record_login()
+        await self._save_session()
+
+    async def validate_login(self):
+        """Log in now, to check the username and password.
+
+        Raises ``JemenaOutlookAuthError`` if the portal rejects them. The
+        session stays logged in for whoever uses it next.
+        """
+        await self._login()
+
+    async def _ensure_login(self, expired_login=None):
+        """Log in unless another request already has.
+
+        ``expired_login`` is the ``_login_count`` a request started with
+        before finding its session expired; if someone logged in since then
+        the new session is reused instead of logging in again.
+        """
+        async with self._login_lock:
+            if self._logged_in and self._login_count != expired_login:
+                return
+            await self._login()
+
+    async def _retrying(self, request):
+        """Run ``request``, retrying it after transient failures."""
+        for retry in itertools.count():
+            try:
+                return await request()
+            except JemenaOutlookUnavailable as e:
+                delay = self.retry_policy.delay(retry)
+                if delay is None:
+                    raise
+                _LOGGER.debug("Retrying in %.1fs: %s", delay, e)
+                self.metrics.record_retry()
+                await asyncio.sleep(delay)
+
+    async def _with_session(self, request):
+        """Run ``request`` logged in, logging in again once if it expired.
+
+        Calls are refused without a request while the circuit breaker is
+        open. Any answer from the portal, even an error, closes it again.
+        """
+        if not self.breaker.allow():
+            raise JemenaOutlookCircuitOpen(
+                "Jemena outlook unavailable, next try in {:.0f}s".format(
+                    self.breaker.retry_after()
+                )
+            )
+
+        try:
+            await self._ensure_login()
+            login_count = self._login_count
+
+            try:
+                result = await request()
+            except JemenaOutlookSessionExpired as e:
+                _LOGGER.debug("Jemena outlook session expired, logging in: %s", e)
+                self.metrics.record_retry()
+                await self._ensure_login(login_count)
+                result = await request()
+        except JemenaOutlookUnavailable:
+            self.breaker.record_failure()
+            raise
+        except JemenaOutlookError:
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    async def _cached_get(self, url, ttl, key=None, decode=None):
+        """GET a portal page through the response cache and return its body.
+
+        ``key`` replaces the url as cache key for pages whose content depends
+        on more than the url. With ``decode`` the body of a 200 response is
+        never read whole: ``decode(chunks)`` is awaited with an async
+        iterator of its chunks as they arrive, and what it returns is cached
+        and returned in place of the body.
+        """
+        key = key or url
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            if self.tracer.enabled:
+                body = entry.body if decode is None else None
+                self.tracer.response("GET", url, None, body, cached=True)
+            return entry.body
+
+        headers = entry.conditional_headers() if entry is not None else None
+        async with self._session.get(
+            url, headers=headers, timeout=self._timeout
+        ) as raw_res:
+            self._check_session(raw_res)
+
+            if raw_res.status == 304 and entry is not None:
+                self.metrics.record_response(raw_res.status, 0)
+                body = self.cache.revalidated(key, raw_res.headers, ttl)
+                if self.tracer.enabled:
+                    traced = body if decode is None else None
+                    self.tracer.response("GET", url, 304, traced, cached=True)
+                return body
+
+            if raw_res.status == 200 and decode is not None:
+                chunks = _ReceivedChunks(
+                    raw_res.content,
+                    RESPONSE_CHUNK_SIZE,
+                    self.tracer.max_bytes if self.tracer.enabled else 0,
+                )
+                try:
+                    body = await decode(chunks)
+                finally:
+                    self.metrics.record_response(raw_res.status, chunks.size)
+                    if self.tracer.enabled:
+                        self.tracer.response(
+                            "GET", url, raw_res.status, chunks.head, size=chunks.size
+                        )
+                self.cache.store(key, body, raw_res.headers, ttl)
+                return body
+
+            body = await raw_res.read()
+            self.metrics.record_response(raw_res.status, len(body))
+            if self.tracer.enabled:
+                self.tracer.response("GET", url, raw_res.status, body)
+            if raw_res.status >= 500 or raw_res.status == 429:
+                raise JemenaOutlookUnavailable(
+                    "{} answered HTTP {}".format(url, raw_res.status)
+                )
+            # Any other client error is not worth retrying, nor a sign of an
+            # expired session; its body is no page of the portal.
+            if raw_res.status >= 400:
+                raise JemenaOutlookError(
+                    "{} answered HTTP {}".format(url, raw_res.status)
+                )
+            if raw_res.status == 200:
+                self.cache.store(key, body, raw_res.headers, ttl)
+            return body
+
+    async def _get_login_page(self):
+        """Go to the login page."""
+        try:
+            async with self._session.get(
+                self._host + HOME_PATH, timeout=self._timeout
+            ) as raw_res:
+                content = await raw_res.read()
+                self.metrics.record_response(raw_res.status, len(content))
+                if self.tracer.enabled:
+                    self.tracer.response("GET", raw_res.url, raw_res.status, content)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise JemenaOutlookUnavailable("Can not connect to login page")
+
+        # Get login url
+        found, login_url = find_form_action(content, "loginForm")
+        if not found:
+            raise JemenaOutlookError("No login form found")
+
+        if login_url is None:
+            raise JemenaOutlookError("Cannot find login url")
+
+        return login_url
+
+    async def _post_login_page(self, login_url):
+        """Login to Jemena Electricity Outlook website."""
+        form_data = {
+            "login_email": self.username,
+            "login_password": self.password,
+            "submit": "Sign In",
+        }
+        try:
+            async with self._session.post(
+                self._host + LOGIN_PATH, data=form_data, timeout=self._timeout
+            ) as raw_res:
+                status = raw_res.status
+                rejected = raw_res.url.path.startswith(LOGIN_PATH_PREFIX)
+                # The redirect after the post is a request of its own.
+                for redirect in raw_res.history:
+                    self.metrics.record_response(redirect.status, 0)
+                self.metrics.record_response(status, 0)
+                if self.tracer.enabled:
+                    self.tracer.response("POST", raw_res.url, status)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise JemenaOutlookUnavailable("Cannot submit login form {0}".format(e))
+
+        if status >= 500:
+            raise JemenaOutlookUnavailable(
+                "Login error: Bad HTTP status code. {}".format(status)
+            )
+        if status != 200:
+            raise JemenaOutlookError(
+                "Login error: Bad HTTP status code. {}".format(status)
+            )
+        # A failed login lands back on the login page.
+        if rejected:
+            raise JemenaOutlookAuthError(
+                "Login error: {} was not accepted".format(self.username)
+            )
+
+        return True
+
+    async def _get_tariffs(self):
+        """Get tariff data. This data must be setup by the user first and is not automatically available."""
+
+        try:
+            content = await self._cached_get(
+                self._host + INDEX_PATH, self._cache_ttls[CACHE_TARIFFS]
+            )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise JemenaOutlookUnavailable("Can not connect to login page")
+
+        tariff_data = {}
+
+        with self.metrics.parsing():
+            json_text = find_tariff_json(content)
+            data = json.loads(json_text) if json_text is not None else None
+
+        if data is not None:
+
+            tariff_data = {
+                "supply_charge": self._strip_currency(data["supplyCharge"]),
+                "weekday_peak_cost": self._strip_currency(data["weekdayPeakCost"]),
+                "weekday_offpeak_cost": self._strip_currency(
+                    data["weekdayOffpeakCost"]
+                ),
+                "weekday_shoulder_cost": self._strip_currency(
+                    data["weekdayShoulderCost"]
+                ),
+                "controlled_load_cost": self._strip_currency(
+                    data["controlledLoadCost"]
+                ),
+                "weekend_offpeak_cost": self._strip_currency(
+                    data["weekendOffpeakCost"]
+                ),
+                "single_rate_cost": self._strip_currency(data["singleRateCost"]),
+                "generation_cost": self._strip_currency(data["generationCost"]),
+            }
+
+        return TariffRecord(**tariff_data)
+
+    async def _get_period_json(self, granularity, offset):
+        """Get the json for one period view, e.g. ``day`` 1 for yesterday.
+
+        Only the members in ``PERIOD_VIEW_FIELDS`` are decoded, as the
+        response arrives, and only they are cached.
+        """
+
+        try:
+            #'{}/electricityView/period/day/1'.format(HOST)
+            url = "{}{}/{}/{}".format(self._host, PERIOD_PATH, granularity, offset)
+            ttl = self._cache_ttls[
+                CACHE_CURRENT_PERIOD if offset == 0 else CACHE_PAST_PERIOD
+            ]
+            # Offsets count back from today, so day/1 is another day tomorrow.
+            key = "{}@{}".format(url, portal_today().isoformat())
+            json_output = await self._cached_get(
+                url, ttl, key, lambda chunks: decode_stream(chunks, PERIOD_VIEW_FIELDS)
+            )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("exception data %s", e)
+            raise JemenaOutlookUnavailable("Cannot get {} data".format(granularity))
+
+        except (json.decoder.JSONDecodeError, UnicodeDecodeError):
+            # An expired session gets an HTML page back instead of json.
+            self.cache.discard(key)
+            self._logged_in = False
+            raise JemenaOutlookSessionExpired(
+                "Could not get {} data: not json".format(granularity)
+            )
+
+        if not json_output.get("selectedPeriod"):
+            self.cache.discard(key)
+            raise JemenaOutlookError(
+                "Could not get {} data for selectedPeriod".format(granularity)
+            )
+
+        # A past period is only final once the portal has published all of it.
+        if offset and not is_complete(json_output["selectedPeriod"]):
+            self.cache.discard(key)
+
+        return json_output
+
+    async def _get_day_json(self, days_ago):
+        """Get the day view json, locally when the day and the one before are kept."""
+        day = portal_today() - timedelta(days=days_ago)
+        previous_day = day - timedelta(days=1)
+
+        if self.store is not None:
+            stored = await self.store.async_get_days(self.username, previous_day, day)
+            if day in stored and previous_day in stored and stored[day][1] is not None:
+                period, differences = stored[day]
+                json_output = dict(differences)
+                json_output["selectedPeriod"] = period
+                json_output["comparisonPeriod"] = stored[previous_day][0]
+                return json_output
+
+        json_output = await self._get_period_json(ENDPOINT_DAY, days_ago)
+
+        if self.store is not None:
+            selected = json_output["selectedPeriod"]
+            comparison = json_output.get("comparisonPeriod")
+            if comparison and is_complete(comparison):
+                await self.store.async_put_day(self.username, previous_day, comparison)
+            if is_complete(selected):
+                differences = {key: json_output.get(key) for key in DIFFERENCE_KEYS}
+                await self.store.async_put_day(
+                    self.username, day, selected, differences
+                )
+
+        return json_output
+
+    async def _get_json(self, granularity, offset):
+        """Get any period view's json, day views through the interval store."""
+        if granularity == ENDPOINT_DAY:
+            return await self._get_day_json(offset)
+        return await self._get_period_json(granularity, offset)
+
+    async def _get_period(self, granularity, offset):
+        """Get the record of a period view, e.g. ``week`` 0 for this week."""
+        json_output = await self._get_json(granularity, offset)
+
+        with self.metrics.parsing():
+            return PeriodRecord.from_json(json_output, granularity)
+
+    def _strip_currency(self, amount):
+
+        return locale.atof(amount.strip("$"))
+
+    async def _staged(self, stage, request):
+        # Only the failed stage is retried, within the same session.
+        with self.metrics.stage(stage):
+            return await self._retrying(request)
+
+    async def _fetch_periods(self):
+        # Tariffs and the day, week and month views are independent once
+        # logged in, so fetch them concurrently on the shared session.
+        requests = {
+            ENDPOINT_TARIFFS: (STAGE_TARIFFS, self._get_tariffs),
+            ENDPOINT_DAY: (STAGE_DAY, lambda: self._get_period(ENDPOINT_DAY, 1)),
+            ENDPOINT_WEEK: (STAGE_WEEK, lambda: self._get_period(ENDPOINT_WEEK, 0)),
+            ENDPOINT_MONTH: (
+                STAGE_MONTH,
+                lambda: self._get_period(ENDPOINT_MONTH, 0),
+            ),
+        }
+        names = [name for name in requests if name in self._endpoints]
+        tasks = [asyncio.ensure_future(self._staged(*requests[name])) for name in names]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # One failed stage fails the refresh, so stop the others retrying
+            # in the background, and wait for them to stop so that none of
+            # them answers after the session has been logged in again.
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+        return dict(zip(names, results))
+
+    async def fetch_data(self):
+        """Get the latest data from Jemena Outlook.
+
+        Calls made while a refresh is in progress wait for that refresh
+        instead of starting another one.
+        """
+
+        if not self._endpoints:
+            return
+
+        await self._refresh.run(self._fetch_data)
+
+    async def _fetch_data(self):
+        # Reuse the existing session and only log in when the portal asks.
+        with self.metrics.refresh():
+            results = await self._with_session(self._fetch_periods)
+
+        # Swapped in whole once every period is read: readers of get_data()
+        # see the previous refresh or this one, never a mix, and a failed
+        # refresh leaves the previous one in place.
+        self._data = self._data.replace(**results)
+
+        _LOGGER.debug(
+            "Jemena outlook cache: %d hits, %d misses, %d revalidated",
+            self.cache.hits,
+            self.cache.misses,
+            self.cache.revalidations,
+        )
+
+    async def fetch_day_json(self, days_ago):
+        """Get the json of a day view, from the local store if possible.
+
+        Its requests count towards the day stage of the current refresh.
+        """
+        with self.metrics.stage(STAGE_DAY):
+            return await self.fetch_period_json(ENDPOINT_DAY, days_ago)
+
+    async def fetch_period_json(self, granularity, offset):
+        """Get the raw json of any period view, logging in if needed.
+
+        ``granularity`` is one of ``GRANULARITIES`` and ``offset`` counts
+        periods back from the current one.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError("Unknown period granularity {}".format(granularity))
+        return await self._with_session(
+            lambda: self._retrying(lambda: self._get_json(granularity, offset))
+        )
+
+    async def iter_period_json(
+        self, periods, concurrency=4, rate=None, return_exceptions=False
+    ):
+        """Yield ``(granularity, offset, json)`` for each of ``periods``.
+
+        ``periods`` is an iterable of ``(granularity, offset)``. Up to
+        ``concurrency`` views are fetched at once, starting at most ``rate``
+        per second, and each is yielded as soon as it arrives, so the caller
+        can work on one while the next downloads. With ``return_exceptions``
+        a failed view yields its ``JemenaOutlookError`` in place of the json
+        instead of ending the iteration.
+        """
+        periods = list(periods)
+        for granularity, _ in periods:
+            if granularity not in GRANULARITIES:
+                raise ValueError("Unknown period granularity {}".format(granularity))
+
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = RateLimiter(rate)
+
+        async def fetch(granularity, offset):
+            async with semaphore:
+                await limiter.acquire()
+                try:
+                    result = await self.fetch_period_json(granularity, offset)
+                except JemenaOutlookError as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+                return granularity, offset, result
+
+        tasks = [asyncio.ensure_future(fetch(*period)) for period in periods]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_periods(self, periods, concurrency=4, rate=None):
+        """Yield ``(granularity, offset, PeriodRecord)`` like ``iter_period_json``."""
+        async for granularity, offset, json_output in self.iter_period_json(
+            periods, concurrency, rate
+        ):
+            yield granularity, offset, PeriodRecord.from_json(json_output, granularity)
+
+    def get_data(self):
+        """Return the ``OutlookData`` of the last refresh."""
+        return self._data
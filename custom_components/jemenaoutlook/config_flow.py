@@ -0,0 +1,191 @@
+"""Config flow for the Jemena Outlook integration."""
+import logging
+
+import voluptuous as vol
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_NAME, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+import homeassistant.helpers.config_validation as cv
+
+from .client import JemenaOutlookAuthError, JemenaOutlookClient, JemenaOutlookError
+from .const import (
+    CONF_PERIODS,
+    CONF_POLL_WINDOW,
+    CONF_ROLLING_WINDOWS,
+    DATA_FLOW_SESSIONS,
+    DEFAULT_NAME,
+    DEFAULT_POLL_WINDOW,
+    DEFAULT_ROLLING_WINDOWS,
+    DOMAIN,
+    ENDPOINT_DAY,
+    ENDPOINT_MONTH,
+    ENDPOINT_WEEK,
+    PERIODS,
+    ROLLING_WINDOWS,
+)
+from .coordinator import cookie_file_path
+
+_LOGGER = logging.getLogger(__name__)
+
+PERIOD_LABELS = {
+    ENDPOINT_DAY: "Yesterday and the day before",
+    ENDPOINT_WEEK: "This week and last week",
+    ENDPOINT_MONTH: "This month and last month",
+}
+
+ROLLING_WINDOW_LABELS = {
+    str(days): "Last {} days".format(days) for days in ROLLING_WINDOWS
+}
+
+
+class JemenaOutlookConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Add an Electricity Outlook account.
+
+    The credentials are checked by logging in once. That session is handed
+    over to the new entry, see ``async_setup_entry``. When the portal later
+    rejects the password, the reauth steps ask for it again.
+    """
+
+    VERSION = 1
+
+    _reauth_entry = None
+
+    async def async_step_user(self, user_input=None):
+        """Ask for the account's credentials and check them."""
+        errors = {}
+        if user_input is not None:
+            username = user_input[CONF_USERNAME]
+            name = user_input[CONF_NAME]
+            await self.async_set_unique_id(username.lower())
+            self._abort_if_unique_id_configured()
+
+            if any(
+                entry.data.get(CONF_NAME) == name
+                for entry in self._async_current_entries(include_ignore=False)
+            ):
+                errors[CONF_NAME] = "name_in_use"
+            else:
+                errors = await self._async_validate(user_input)
+
+            if not errors:
+                return self.async_create_entry(
+                    title=name,
+                    data=user_input,
+                    options={
+                        CONF_PERIODS: list(PERIODS),
+                        CONF_POLL_WINDOW: DEFAULT_POLL_WINDOW,
+                        CONF_ROLLING_WINDOWS: [
+                            str(days) for days in DEFAULT_ROLLING_WINDOWS
+                        ],
+                    },
+                )
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_USERNAME): cv.string,
+                vol.Required(CONF_PASSWORD): cv.string,
+                vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+            }
+        )
+        # Keep what was entered, except the password, when the form is shown again.
+        suggested = {
+            key: value
+            for key, value in (user_input or {}).items()
+            if key != CONF_PASSWORD
+        }
+        return self.async_show_form(
+            step_id="user",
+            data_schema=self.add_suggested_values_to_schema(schema, suggested),
+            errors=errors,
+        )
+
+    async def _async_validate(self, user_input):
+        """Log in with the given credentials, returns the form errors."""
+        username = user_input[CONF_USERNAME]
+        session = async_create_clientsession(self.hass)
+        client = JemenaOutlookClient(
+            session,
+            username,
+            user_input[CONF_PASSWORD],
+            cookie_file=cookie_file_path(self.hass, username),
+        )
+        try:
+            await client.validate_login()
+        except JemenaOutlookAuthError:
+            errors = {"base": "invalid_auth"}
+        except JemenaOutlookError as e:
+            _LOGGER.debug("Jemena outlook login failed: %s", e)
+            errors = {"base": "cannot_connect"}
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected error logging in to Jemena outlook")
+            errors = {"base": "unknown"}
+        else:
+            self.hass.data.setdefault(DATA_FLOW_SESSIONS, {})[username] = session
+            return {}
+
+        session.detach()
+        return errors
+
+    async def async_step_reauth(self, entry_data):
+        """Start asking for a new password after the portal rejected it."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Ask for the password and check it, then reload the account."""
+        entry = self._reauth_entry
+        errors = {}
+        if user_input is not None:
+            data = {**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+            errors = await self._async_validate(data)
+            if not errors:
+                # Reloaded even with the same password, which the portal
+                # takes again, so the logged in session is taken over.
+                self.hass.config_entries.async_update_entry(entry, data=data)
+                self.hass.config_entries.async_schedule_reload(entry.entry_id)
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): cv.string}),
+            description_placeholders={CONF_USERNAME: entry.data[CONF_USERNAME]},
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return JemenaOutlookOptionsFlow(config_entry)
+
+
+class JemenaOutlookOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
+    """Change the periods read, the poll window and the rolling windows."""
+
+    async def async_step_init(self, user_input=None):
+        """Show the options form."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_PERIODS, default=self.options.get(CONF_PERIODS, list(PERIODS))
+                ): cv.multi_select(PERIOD_LABELS),
+                vol.Required(
+                    CONF_POLL_WINDOW,
+                    default=self.options.get(CONF_POLL_WINDOW, DEFAULT_POLL_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=12)),
+                vol.Required(
+                    CONF_ROLLING_WINDOWS,
+                    default=self.options.get(
+                        CONF_ROLLING_WINDOWS,
+                        [str(days) for days in DEFAULT_ROLLING_WINDOWS],
+                    ),
+                ): cv.multi_select(ROLLING_WINDOW_LABELS),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -0,0 +1,161 @@
+"""Constants for the Jemena Outlook integration."""
+from datetime import timedelta
+
+DOMAIN = "jemenaoutlook"
+
+DEFAULT_NAME = "JemenaOutlook"
+
+SCAN_INTERVAL = timedelta(hours=24)
+
+REQUESTS_TIMEOUT = 15
+# Period views are decoded as they arrive, this many bytes at a time.
+RESPONSE_CHUNK_SIZE = 8192
+
+CONF_ACCOUNTS = "accounts"
+CONF_PERSIST_SESSION = "persist_session"
+CONF_DIAGNOSTICS = "diagnostics"
+
+# Options of an account added through the UI: the period views to create
+# sensors for, tariffs are always read, and how many hours past the expected
+# publication time yesterday's figures keep being probed for.
+CONF_PERIODS = "periods"
+CONF_POLL_WINDOW = "poll_window"
+DEFAULT_POLL_WINDOW = 2
+
+# Rolling windows, in days, that sensors can be created for from the stored
+# days, and how many weeks back the same weekday baseline looks.
+CONF_ROLLING_WINDOWS = "rolling_windows"
+ROLLING_WINDOWS = (7, 30, 90, 365)
+DEFAULT_ROLLING_WINDOWS = (7, 30)
+BASELINE_WEEKS = 4
+
+# Sessions logged in by the config flow, by username, until the entry's
+# setup takes them over.
+DATA_FLOW_SESSIONS = "{}_flow_sessions".format(DOMAIN)
+
+# Seconds between the first refreshes of successive accounts, plus up to
+# ACCOUNT_JITTER seconds of random delay. Later refreshes keep the spacing.
+ACCOUNT_STAGGER = 300
+ACCOUNT_JITTER = 60
+
+HOST = "https://electricityoutlook.jemena.com.au"
+HOME_PATH = "/login/index"
+LOGIN_PATH = "/login_security_check"
+INDEX_PATH = "/electricityView/index"
+PERIOD_PATH = "/electricityView/period"
+
+ENDPOINT_TARIFFS = "tariffs"
+ENDPOINT_DAY = "day"
+ENDPOINT_WEEK = "week"
+ENDPOINT_MONTH = "month"
+ENDPOINTS = (ENDPOINT_TARIFFS, ENDPOINT_DAY, ENDPOINT_WEEK, ENDPOINT_MONTH)
+PERIODS = (ENDPOINT_DAY, ENDPOINT_WEEK, ENDPOINT_MONTH)
+
+# Period views of electricityView/period/<granularity>/<offset>. No sensor
+# reads the season view, it is only fetched on request.
+GRANULARITY_SEASON = "season"
+GRANULARITIES = (ENDPOINT_DAY, ENDPOINT_WEEK, ENDPOINT_MONTH, GRANULARITY_SEASON)
+
+# Sensors filled from the tariff script on the electricityView index page.
+TARIFF_SENSORS = (
+    "supply_charge",
+    "weekday_peak_cost",
+    "weekday_offpeak_cost",
+    "weekday_shoulder_cost",
+    "controlled_load_cost",
+    "weekend_offpeak_cost",
+    "single_rate_cost",
+    "generation_cost",
+)
+
+# Sensor key prefixes filled from each period view.
+PERIOD_PREFIXES = {
+    ENDPOINT_DAY: ("yesterday_", "previous_day_"),
+    ENDPOINT_WEEK: ("this_week_", "last_week_"),
+    ENDPOINT_MONTH: ("this_month_", "last_month_"),
+}
+
+# Interval series of a period view, usage channels first.
+CONSUMPTION_KEYS = (
+    "peak",
+    "offpeak",
+    "shoulder",
+    "controlledLoad",
+    "generation",
+    "suburbAverage",
+)
+COST_KEYS = ("peak", "offpeak", "shoulder", "controlledLoad", "generation")
+
+# Interval series in a period's consumptionData, keyed by the portal's name,
+# with the sensor key suffix used for them.
+CONSUMPTION_CHANNELS = {
+    "peak": "consumption_peak",
+    "offpeak": "consumption_offpeak",
+    "shoulder": "consumption_shoulder",
+    "controlledLoad": "consumption_controlled_load",
+    "generation": "generation",
+}
+
+# Dates in the portal, e.g. what "yesterday" is, follow Victorian time.
+PORTAL_TIMEZONE = "Australia/Melbourne"
+
+# How long, in seconds, each kind of portal page is cached. None keeps a page
+# for good; a past period's figures no longer change once published.
+CACHE_TARIFFS = "tariffs"
+CACHE_CURRENT_PERIOD = "current_period"
+CACHE_PAST_PERIOD = "past_period"
+DEFAULT_CACHE_TTLS = {
+    CACHE_TARIFFS: 7 * 24 * 3600,
+    CACHE_CURRENT_PERIOD: 3600,
+    CACHE_PAST_PERIOD: None,
+}
+CONF_CACHE_TTL = "cache_ttl"
+
+STORE_FILE = "jemenaoutlook.db"
+DATA_STORE = "{}_store".format(DOMAIN)
+
+SERVICE_BACKFILL = "backfill"
+ATTR_DAYS = "days"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_RATE = "rate"
+ATTR_ACCOUNT = "account"
+DEFAULT_BACKFILL_CONCURRENCY = 4
+DEFAULT_BACKFILL_RATE = 2.0
+
+SERVICE_DUMP_METRICS = "dump_metrics"
+ATTR_PATH = "path"
+METRICS_FILE = "jemenaoutlook.prom"
+
+SERVICE_COMPARE_TARIFFS = "compare_tariffs"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_TARIFFS = "tariffs"
+ATTR_SUPPLY_CHARGE = "supply_charge"
+ATTR_RATES = "rates"
+ATTR_CONTROLLED_LOAD_RATE = "controlled_load_rate"
+ATTR_GENERATION_RATE = "generation_rate"
+DEFAULT_COMPARE_DAYS = 30
+
+SERVICE_SET_TRACING = "set_tracing"
+ATTR_ENABLED = "enabled"
+ATTR_SAMPLE_RATE = "sample_rate"
+ATTR_MAX_BYTES = "max_bytes"
+
+# Transient failures of a refresh stage are retried with exponential backoff
+# and jitter: at most RETRY_ATTEMPTS attempts, waits up to RETRY_BASE_DELAY
+# seconds doubling to RETRY_MAX_DELAY.
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 30.0
+
+# After BREAKER_THRESHOLD failed calls in a row the portal is left alone for
+# BREAKER_RESET_TIMEOUT seconds, doubling up to BREAKER_MAX_RESET_TIMEOUT
+# while it stays down. A failed refresh is tried again after RETRY_INTERVAL.
+BREAKER_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 300.0
+BREAKER_MAX_RESET_TIMEOUT = 3600.0
+RETRY_INTERVAL = timedelta(minutes=5)
+
+# The portal redirects any request without a valid session to /login/...
+# The trailing slash keeps LOGIN_PATH, /login_security_check, from matching.
+LOGIN_PATH_PREFIX = "/login/"
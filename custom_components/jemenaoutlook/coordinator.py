@@ -0,0 +1,307 @@
+"""Data update coordinator for the Jemena Outlook integration."""
+import asyncio
+from datetime import timedelta
+import logging
+import random
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.start import async_at_start
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .backfill import JemenaOutlookBackfill
+from .client import (
+    JemenaOutlookAuthError,
+    JemenaOutlookClient,
+    JemenaOutlookError,
+    portal_today,
+)
+from .const import (
+    ACCOUNT_JITTER,
+    ACCOUNT_STAGGER,
+    BASELINE_WEEKS,
+    DATA_STORE,
+    DOMAIN,
+    ENDPOINT_DAY,
+    ENDPOINTS,
+    REQUESTS_TIMEOUT,
+    RETRY_INTERVAL,
+    SCAN_INTERVAL,
+    STORE_FILE,
+)
+from .schedule import PublicationSchedule
+from .singleflight import SingleFlight
+from .statistics import async_import_new_days
+from .store import IntervalStore, is_complete
+from .tariff import Tariff, price_days
+from .windows import RollingWindows, summarize_days
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_store(hass):
+    """Return the interval store shared by all accounts."""
+    if DATA_STORE not in hass.data:
+        store = hass.data[DATA_STORE] = IntervalStore(hass.config.path(STORE_FILE))
+
+        async def _async_close(event):
+            await store.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close)
+
+    return hass.data[DATA_STORE]
+
+
+def cookie_file_path(hass, username):
+    """Return where an account's login cookies are kept between restarts."""
+    return hass.config.path(
+        STORAGE_DIR, "{}.{}.cookies".format(DOMAIN, slugify(username))
+    )
+
+
+def first_refresh_delay(index):
+    """Return the seconds to wait before the first refresh of the index-th account.
+
+    The first account is refreshed straight away and the others are
+    staggered so the accounts never hit the portal at the same moment.
+    """
+    if index == 0:
+        return 0
+    return index * ACCOUNT_STAGGER + random.uniform(0, ACCOUNT_JITTER)
+
+
+class JemenaOutlookData(DataUpdateCoordinator):
+    """Get data from JemenaOutlook.
+
+    One coordinator is shared by every sensor of an account, so the portal
+    is scraped once per interval no matter how many variables are monitored.
+
+    With the day view enabled, refreshes follow the portal's publication of
+    yesterday's figures instead of a fixed interval: each update first
+    probes the day view alone, and only refreshes everything when it has
+    changed. See ``PublicationSchedule``.
+
+    Rolling windows are kept up to date from the days stored by the day
+    view, only reading the days stored since the last update. See
+    ``RollingWindows``.
+    """
+
+    def __init__(
+        self,
+        hass,
+        session,
+        username,
+        password,
+        name,
+        cookie_file=None,
+        endpoints=ENDPOINTS,
+        cache_ttls=None,
+        poll_window=None,
+        rolling_windows=(),
+    ):
+        """Initialize the data object.
+
+        ``poll_window`` overrides how long past the expected publication
+        time yesterday's figures keep being probed for. ``rolling_windows``
+        are the lengths in days of the rolling windows to keep, which need
+        the day view.
+        """
+        super().__init__(hass, _LOGGER, name=name, update_interval=SCAN_INTERVAL)
+        self.client = JemenaOutlookClient(
+            session,
+            username,
+            password,
+            REQUESTS_TIMEOUT,
+            cookie_file,
+            endpoints,
+            async_get_store(hass),
+            cache_ttls,
+        )
+        self.backfill = JemenaOutlookBackfill(hass, self)
+        self.schedule = None
+        if ENDPOINT_DAY in endpoints:
+            self.schedule = PublicationSchedule()
+            if poll_window is not None:
+                self.schedule.window = poll_window
+        self.rolling_windows = tuple(sorted(rolling_windows))
+        self.windows = None
+        if ENDPOINT_DAY in endpoints and rolling_windows:
+            self.windows = RollingWindows(rolling_windows, BASELINE_WEEKS)
+        self._windows_lock = asyncio.Lock()
+        self._update = SingleFlight()
+        self._day_changed = False
+        self._day_due = None
+
+    @callback
+    def async_set_poll_window(self, poll_window):
+        """Change the probing window, from the next update on."""
+        if self.schedule is not None:
+            self.schedule.window = poll_window
+
+    @callback
+    def async_schedule_first_refresh(self, delay=0):
+        """Refresh ``delay`` seconds after Home Assistant has started.
+
+        Later refreshes follow from the first one and keep the delay, see
+        ``PublicationSchedule.offset``. Returns a callback that cancels the
+        refresh if it has not happened yet.
+        """
+        if self.schedule is not None:
+            self.schedule.offset = timedelta(seconds=delay)
+        cancel_start = cancel_later = None
+
+        async def _async_refresh(now):
+            # A failure is logged by the coordinator itself.
+            await self.async_refresh()
+
+        @callback
+        def _async_started(hass):
+            nonlocal cancel_start, cancel_later
+            cancel_start = None
+            cancel_later = async_call_later(hass, delay, _async_refresh)
+
+        cancel_start = async_at_start(self.hass, _async_started)
+
+        @callback
+        def _async_cancel():
+            if cancel_start is not None:
+                cancel_start()
+            if cancel_later is not None:
+                cancel_later()
+
+        return _async_cancel
+
+    async def async_compare_tariffs(self, start, end, tariffs):
+        """Price the stored days from ``start`` to ``end`` under each tariff.
+
+        The account's own tariff is priced too once it has been read.
+        Returns a ``CostBreakdown`` per tariff, cheapest first.
+        """
+        tariffs = list(tariffs)
+        if self.data is not None and self.data.tariffs is not None:
+            try:
+                tariffs.insert(0, Tariff.from_record(self.data.tariffs))
+            except ValueError as e:
+                _LOGGER.debug("Not pricing the current tariff: %s", e)
+
+        days = await self.client.store.async_get_days(self.client.username, start, end)
+        consumption = {
+            day: period["consumptionData"] for day, (period, _) in days.items()
+        }
+        return await self.hass.async_add_executor_job(price_days, tariffs, consumption)
+
+    async def async_update_windows(self, rebuild=False):
+        """Push the days stored since the last update into the rolling windows.
+
+        Only days after the latest one already pushed are read from the
+        store, unless ``rebuild`` starts the windows over, as needed once a
+        backfill has stored older days.
+        """
+        if self.windows is None:
+            return
+
+        async with self._windows_lock:
+            windows = self.windows
+            if rebuild:
+                windows = RollingWindows(windows.lengths, windows.baseline.weeks)
+            if windows.last_day is None:
+                start = portal_today() - timedelta(days=windows.span)
+            else:
+                start = windows.last_day + timedelta(days=1)
+
+            days = await self.client.store.async_get_days(self.client.username, start)
+            summaries = await self.hass.async_add_executor_job(summarize_days, days)
+            for summary in summaries:
+                windows.push(summary)
+            windows.expect(self._day_due)
+            self.windows = windows
+
+    async def _async_update_data(self):
+        """Fetch latest data from Jemena Outlook.
+
+        A failed refresh is tried again after ``RETRY_INTERVAL`` instead of a
+        whole ``SCAN_INTERVAL`` later, or once the client's circuit breaker
+        lets calls through again if that is later. Rejected credentials do
+        not get better by retrying and every try posts them to the portal
+        again, so those are only tried again a ``SCAN_INTERVAL`` later, and
+        an account added through the UI asks for its password again.
+
+        Updates overlapping one in progress, from a scheduled refresh, a
+        manual ``homeassistant.update_entity`` or a service, share its result.
+        """
+        return await self._update.run(self._async_update)
+
+    async def _async_update(self):
+        try:
+            if self.schedule is None:
+                await self.client.fetch_data()
+                self.update_interval = SCAN_INTERVAL
+            else:
+                await self._async_probe_and_fetch()
+        except JemenaOutlookAuthError as exp:
+            self.update_interval = SCAN_INTERVAL
+            if self.config_entry is not None:
+                raise ConfigEntryAuthFailed(
+                    "Jemena Outlook rejected the login: {}".format(exp)
+                ) from exp
+            raise UpdateFailed(
+                "Jemena Outlook rejected the login: {}".format(exp)
+            ) from exp
+        except JemenaOutlookError as exp:
+            self.update_interval = max(
+                RETRY_INTERVAL, timedelta(seconds=self.client.breaker.retry_after())
+            )
+            raise UpdateFailed(
+                "Error on receive last Jemena Outlook data: {}".format(exp)
+            ) from exp
+
+        return self.client.get_data()
+
+    async def _async_probe_and_fetch(self):
+        now = dt_util.now()
+        # The probe, any login it needs and the full fetch after it are
+        # measured as one refresh.
+        with self.client.metrics.refresh():
+            # Once complete, the day is read back from the interval store, so
+            # probing it costs no request until the next day is due.
+            day_json = await self.client.fetch_day_json(1)
+            period = day_json["selectedPeriod"]
+            complete = is_complete(period)
+            yesterday = portal_today() - timedelta(days=1)
+            # The schedule keeps the day it has seen, so a change is also
+            # remembered here until it has been fetched and imported: a
+            # refresh that fails on the way is done again at the next probe.
+            if self.schedule.observe(now, yesterday, period, complete):
+                self._day_changed = True
+            changed = self._day_changed
+
+            if changed or self.data is None:
+                await self.client.fetch_data()
+
+        # A newly completed day has just been stored, add its intervals to
+        # the long-term statistics and the rolling windows.
+        if changed and complete:
+            await async_import_new_days(
+                self.hass, self.client.username, self.name, self.client.store
+            )
+        # Until yesterday is published, the day before is the latest due.
+        self._day_due = yesterday if complete else yesterday - timedelta(days=1)
+        if (changed and complete) or self.data is None:
+            await self.async_update_windows()
+        elif self.windows is not None:
+            self.windows.expect(self._day_due)
+        self._day_changed = False
+
+        self.update_interval = self.schedule.next_update(now)
+        _LOGGER.debug(
+            "Next %s update in %s, expecting data at %s",
+            self.name,
+            self.update_interval,
+            self.schedule.publication_time,
+        )
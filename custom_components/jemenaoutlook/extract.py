@@ -0,0 +1,122 @@
+"""
+Lightweight extraction of the few values the client needs from portal pages.
+
+The login page only contributes the login form's ``action`` and the
+electricityView index page only the ``var tariff = {...};`` script. Both are
+found with a precompiled regex first; if the markup ever stops matching, an
+``html.parser`` scan is used that stops at the first match instead of
+building a document tree.
+"""
+from html import unescape
+from html.parser import HTMLParser
+import re
+
+_FORM_TAG_RE = re.compile(r"<form\b[^>]*>", re.IGNORECASE)
+_ID_ATTR_RE = re.compile(r"""\sid\s*=\s*(["']?)([^"'\s>]+)\1""", re.IGNORECASE)
+_ACTION_ATTR_RE = re.compile(
+    r"""\saction\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE
+)
+_TARIFF_MARKER = "var tariff ="
+_TARIFF_RE = re.compile(r"^\s*var tariff =\s*({.*?})\s*;\s*$", re.DOTALL | re.MULTILINE)
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _FormActionParser(HTMLParser):
+    def __init__(self, form_id):
+        super().__init__(convert_charrefs=True)
+        self.form_id = form_id
+        self.found = False
+        self.action = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "form":
+            return
+        attrs = dict(attrs)
+        if attrs.get("id") == self.form_id:
+            self.found = True
+            self.action = attrs.get("action")
+            raise _StopParsing()
+
+
+class _ScriptTextParser(HTMLParser):
+    def __init__(self, marker):
+        super().__init__(convert_charrefs=True)
+        self.marker = marker
+        self.in_script = False
+        self.text = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script":
+            self.in_script = True
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self.in_script = False
+
+    def handle_data(self, data):
+        if self.in_script and self.marker in data:
+            self.text = data
+            raise _StopParsing()
+
+
+def _as_text(content):
+    if isinstance(content, bytes):
+        return content.decode("utf-8", errors="replace")
+    return content
+
+
+def _feed(parser, text):
+    try:
+        parser.feed(text)
+    except _StopParsing:
+        pass
+
+
+def find_form_action(content, form_id):
+    """Return ``(found, action)`` for the form with the given id.
+
+    ``found`` is False when there is no such form; ``action`` is None when
+    the form has no action attribute.
+    """
+    text = _as_text(content)
+
+    for match in _FORM_TAG_RE.finditer(text):
+        tag = match.group(0)
+        id_match = _ID_ATTR_RE.search(tag)
+        if id_match is None or id_match.group(2) != form_id:
+            continue
+        action_match = _ACTION_ATTR_RE.search(tag)
+        if action_match is None:
+            break
+        action = next(g for g in action_match.groups() if g is not None)
+        return True, unescape(action)
+
+    parser = _FormActionParser(form_id)
+    _feed(parser, text)
+    return parser.found, parser.action
+
+
+def find_tariff_json(content):
+    """Return the json text assigned to ``var tariff`` or None."""
+    text = _as_text(content)
+
+    # Jump straight to the assignment rather than trying the pattern at the
+    # start of every line of the page.
+    start = text.find(_TARIFF_MARKER)
+    if start != -1:
+        match = _TARIFF_RE.match(text, text.rfind("\n", 0, start) + 1)
+        if match is not None:
+            return match.group(1)
+
+    parser = _ScriptTextParser(_TARIFF_MARKER)
+    _feed(parser, text)
+    if parser.text is None:
+        return None
+
+    match = re.search(r"var tariff =\s*({.*?})\s*;", parser.text, flags=re.DOTALL)
+    if match is None:
+        return None
+    return match.group(1)
@@ -0,0 +1,207 @@
+"""
+Selective decoding of json documents as they are received.
+
+``decode_stream`` reads a json object from an async iterator of byte chunks,
+such as a response's ``content.iter_chunked()``, and only builds Python
+objects for the members it is asked for, following nested objects where it
+is asked for some of their members. Everything else, such as the chart
+options and labels of a period view, is stepped over as it arrives. Only
+the chunk being scanned and the text of the member being decoded are held,
+never the whole document.
+"""
+import codecs
+import json
+from json.decoder import JSONDecodeError, scanstring
+import re
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Within an array or object only strings and brackets matter for finding
+# its end. Strings are matched whole so brackets inside them are ignored; a
+# lone quote starts a string cut off at the end of the text received so far.
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|"|[\[\]{}]', re.DOTALL)
+_SCALAR = re.compile(r"[^,\]}\s]+")
+
+
+class _Scanner(object):
+    """The text of a document received so far, from the part still needed.
+
+    ``pos`` is where scanning is up to. Text before it is dropped as more
+    arrives, unless ``mark`` holds on to the start of a member being kept.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks.__aiter__()
+        self._head = b""
+        self._decoder = None
+        self._ended = False
+        self.text = ""
+        self.pos = 0
+        self.mark = None
+
+    async def _next_chunk(self):
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    async def fill(self):
+        """Receive more of the document, returns False once it has all arrived."""
+        if self._ended:
+            return False
+
+        text = ""
+        while not text:
+            chunk = await self._next_chunk()
+            if chunk is None:
+                self._ended = True
+                if self._decoder is None and self._head:
+                    self._start_decoding()
+                if self._decoder is not None:
+                    text = self._decoder.decode(b"", final=True)
+                break
+            if self._decoder is None:
+                # The encoding is told by the first four bytes, as json.loads does.
+                self._head += chunk
+                if len(self._head) < 4:
+                    continue
+                chunk = self._start_decoding()
+            text = self._decoder.decode(chunk)
+
+        start = self.pos if self.mark is None else self.mark
+        self.text = self.text[start:] + text
+        self.pos -= start
+        if self.mark is not None:
+            self.mark = 0
+        return True
+
+    def _start_decoding(self):
+        encoding = json.detect_encoding(self._head)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        head, self._head = self._head, b""
+        return head
+
+    def error(self, message):
+        return JSONDecodeError(message, self.text, self.pos)
+
+    async def peek(self):
+        """Return the next character that is not whitespace."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                raise self.error("Unexpected end of document")
+
+    async def read_string(self):
+        """Decode the string at ``pos``."""
+        while _STRING.match(self.text, self.pos) is None:
+            if not await self.fill():
+                raise self.error("Unterminated string")
+        value, self.pos = scanstring(self.text, self.pos + 1)
+        return value
+
+    async def skip_value(self):
+        """Move ``pos`` past the value at it."""
+        char = await self.peek()
+        if char == '"':
+            await self.read_string()
+            return
+
+        if char not in "[{":
+            while True:
+                match = _SCALAR.match(self.text, self.pos)
+                if match is None:
+                    raise self.error("Expecting value")
+                if match.end() < len(self.text) or not await self.fill():
+                    self.pos = match.end()
+                    return
+
+        depth = 0
+        while True:
+            for match in _STRUCTURE.finditer(self.text, self.pos):
+                if match.group() == '"':
+                    self.pos = match.start()
+                    break
+                self.pos = match.end()
+                char = match.group()[0]
+                if char == '"':
+                    continue
+                depth += 1 if char in "[{" else -1
+                if depth == 0:
+                    return
+            else:
+                self.pos = len(self.text)
+            if not await self.fill():
+                raise self.error("Unterminated value")
+
+    async def decode_value(self):
+        """Decode the value at ``pos`` whole."""
+        await self.peek()
+        self.mark = self.pos
+        try:
+            # Receive all of it first, then decode it where it lies.
+            await self.skip_value()
+            value, end = _DECODER.raw_decode(self.text, self.mark)
+        finally:
+            self.mark = None
+        if end != self.pos:
+            raise JSONDecodeError("Invalid value", self.text, end)
+        return value
+
+    async def decode_object(self, fields):
+        """Decode the object at ``pos``, keeping only ``fields``."""
+        if await self.peek() != "{":
+            return await self.decode_value()
+
+        result = {}
+        self.pos += 1
+        if await self.peek() == "}":
+            self.pos += 1
+            return result
+
+        while True:
+            if await self.peek() != '"':
+                raise self.error("Expecting property name")
+            key = await self.read_string()
+            if await self.peek() != ":":
+                raise self.error("Expecting ':' delimiter")
+            self.pos += 1
+
+            if key not in fields:
+                await self.skip_value()
+            elif fields[key] is None:
+                result[key] = await self.decode_value()
+            else:
+                result[key] = await self.decode_object(fields[key])
+
+            char = await self.peek()
+            self.pos += 1
+            if char == "}":
+                return result
+            if char != ",":
+                raise self.error("Expecting ',' delimiter")
+
+
+async def decode_stream(chunks, fields):
+    """Decode the members ``fields`` names from a json object as it arrives.
+
+    ``chunks`` is an async iterator of the document's bytes, decoded as
+    ``json.loads`` would. ``fields`` maps each member to keep to None, to
+    decode it whole, or to the ``fields`` of the nested object to keep.
+    Raises ``JSONDecodeError`` if the document is not a json object, and
+    ``UnicodeDecodeError`` if the bytes cannot be decoded.
+    """
+    scanner = _Scanner(chunks)
+    if await scanner.peek() != "{":
+        raise scanner.error("Expecting object")
+    result = await scanner.decode_object(fields)
+
+    # Only whitespace may follow the object.
+    while True:
+        scanner.pos = _WHITESPACE.match(scanner.text, scanner.pos).end()
+        if scanner.pos < len(scanner.text):
+            raise scanner.error("Extra data")
+        if not await scanner.fill():
+            return result
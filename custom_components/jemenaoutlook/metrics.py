@@ -0,0 +1,219 @@
+"""Refresh instrumentation for the Jemena Outlook client."""
+from contextlib import contextmanager
+import contextvars
+import time
+
+STAGE_LOGIN = "login"
+STAGE_TARIFFS = "tariffs"
+STAGE_DAY = "day"
+STAGE_WEEK = "week"
+STAGE_MONTH = "month"
+STAGES = (STAGE_LOGIN, STAGE_TARIFFS, STAGE_DAY, STAGE_WEEK, STAGE_MONTH)
+
+# The stage the running task works for. Each task started by gather gets a
+# copy of the context, so concurrent stages record into their own entry.
+_current_stage = contextvars.ContextVar("jemenaoutlook_stage", default=None)
+
+
+class StageMetrics(object):
+    """What one stage of the last refresh cost."""
+
+    __slots__ = ("duration", "requests", "bytes", "status", "retries", "parse_time")
+
+    def __init__(self):
+        self.duration = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.status = None
+        self.retries = 0
+        self.parse_time = 0.0
+
+
+class FetchMetrics(object):
+    """Per-stage timings and request counts of the client's last refresh.
+
+    Besides the last refresh's stages, counters of all refreshes since start
+    are kept for export as monotonic metrics.
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.stages = {}
+        self.refresh_duration = None
+        self.refresh_requests = 0
+        self.refresh_bytes = 0
+        self.refresh_retries = 0
+        self.last_status = None
+        self.refreshes = 0
+        self.failures = 0
+        self.requests_total = 0
+        self.bytes_total = 0
+        self.retries_total = 0
+        self.logins_total = 0
+        self._refreshing = False
+
+    @contextmanager
+    def refresh(self):
+        """Measure one refresh, replacing the previous refresh's stages.
+
+        A refresh entered within one, like the full fetch that follows a
+        probe of the day view, is measured as part of the outer refresh.
+        """
+        if self._refreshing:
+            yield
+            return
+
+        self._refreshing = True
+        self.stages = {}
+        self.refresh_requests = 0
+        self.refresh_bytes = 0
+        retries = self.retries_total
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._refreshing = False
+            self.refreshes += 1
+            self.refresh_duration = time.perf_counter() - start
+            self.refresh_retries = self.retries_total - retries
+
+    @contextmanager
+    def stage(self, name):
+        """Attribute the time and requests of the enclosed code to a stage."""
+        stage = self.stages.setdefault(name, StageMetrics())
+        token = _current_stage.set(stage)
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.duration += time.perf_counter() - start
+            _current_stage.reset(token)
+
+    @contextmanager
+    def parsing(self):
+        """Count the enclosed code as parse time of the current stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage = _current_stage.get()
+            if stage is not None:
+                stage.parse_time += time.perf_counter() - start
+
+    def record_response(self, status, size):
+        """Record a response of ``size`` body bytes."""
+        self.requests_total += 1
+        self.bytes_total += size
+        self.last_status = status
+        stage = _current_stage.get()
+        if stage is not None:
+            stage.requests += 1
+            stage.bytes += size
+            stage.status = status
+            self.refresh_requests += 1
+            self.refresh_bytes += size
+
+    def record_retry(self):
+        self.retries_total += 1
+        stage = _current_stage.get()
+        if stage is not None:
+            stage.retries += 1
+
+    def record_login(self):
+        self.logins_total += 1
+
+    def stage_duration(self, name):
+        """Return how long stage ``name`` took in the last refresh, if it ran."""
+        stage = self.stages.get(name)
+        return stage.duration if stage is not None else None
+
+    def values(self):
+        """Return the last refresh's metrics as a flat dict.
+
+        Keys are ``refresh_duration``, ``refresh_requests``, ``refresh_bytes``,
+        ``refresh_retries``, ``last_status`` and ``<stage>_duration`` for each
+        stage that ran. Durations are in seconds.
+        """
+        values = {
+            "refresh_duration": self.refresh_duration,
+            "refresh_requests": self.refresh_requests,
+            "refresh_bytes": self.refresh_bytes,
+            "refresh_retries": self.refresh_retries,
+            "last_status": self.last_status,
+        }
+        for name, stage in self.stages.items():
+            values[name + "_duration"] = stage.duration
+        return values
+
+
+def _labels(**labels):
+    return ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+
+
+_PROMETHEUS_ACCOUNT_METRICS = (
+    (
+        "refresh_duration_seconds",
+        "gauge",
+        "refresh_duration",
+        "Duration of the last refresh",
+    ),
+    ("refreshes_total", "counter", "refreshes", "Refreshes"),
+    ("refresh_failures_total", "counter", "failures", "Failed refreshes"),
+    ("requests_total", "counter", "requests_total", "Portal requests"),
+    ("response_bytes_total", "counter", "bytes_total", "Response bytes read"),
+    ("retries_total", "counter", "retries_total", "Retried requests"),
+    ("logins_total", "counter", "logins_total", "Logins"),
+)
+
+_PROMETHEUS_STAGE_METRICS = (
+    ("stage_duration_seconds", "duration", "Duration"),
+    ("stage_requests", "requests", "Portal requests"),
+    ("stage_bytes", "bytes", "Response bytes read"),
+    ("stage_retries", "retries", "Retried requests"),
+    ("stage_parse_seconds", "parse_time", "Parse time"),
+    ("stage_last_status", "status", "HTTP status of the last response"),
+)
+
+
+def _sample(name, value, **labels):
+    return "{}{{{}}} {}".format(name, _labels(**labels), value)
+
+
+def prometheus_text(metrics_by_account, prefix="jemenaoutlook"):
+    """Render ``{account: FetchMetrics}`` in the Prometheus text format.
+
+    Account metrics count since start (or describe the last refresh), stage
+    metrics describe the stages of each account's last refresh.
+    """
+    lines = []
+
+    for metric, kind, attr, help_text in _PROMETHEUS_ACCOUNT_METRICS:
+        name = "{}_{}".format(prefix, metric)
+        lines.append("# HELP {} {}.".format(name, help_text))
+        lines.append("# TYPE {} {}".format(name, kind))
+        for account, metrics in metrics_by_account.items():
+            value = getattr(metrics, attr)
+            if value is not None:
+                lines.append(_sample(name, value, account=account))
+
+    for metric, attr, help_text in _PROMETHEUS_STAGE_METRICS:
+        name = "{}_{}".format(prefix, metric)
+        lines.append(
+            "# HELP {} {} per stage of the last refresh.".format(name, help_text)
+        )
+        lines.append("# TYPE {} gauge".format(name))
+        for account, metrics in metrics_by_account.items():
+            for stage_name, stage in metrics.stages.items():
+                value = getattr(stage, attr)
+                if value is not None:
+                    lines.append(
+                        _sample(name, value, account=account, stage=stage_name)
+                    )
+
+    return "\n".join(lines) + "\n"
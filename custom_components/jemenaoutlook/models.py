@@ -0,0 +1,172 @@
+"""
+Typed records of the figures read from the Jemena Outlook portal.
+
+A refresh produces one ``OutlookData`` holding a ``TariffRecord`` and a
+``PeriodRecord`` per period view. Records use ``__slots__`` and keep only
+the figures read from the interval readings, not the readings themselves,
+so many of them stay small. Sensors read a record field through an
+accessor built once with ``sensor_accessor``.
+"""
+from .aggregate import aggregate_period
+from .const import ENDPOINT_DAY, ENDPOINTS, PERIOD_PREFIXES, TARIFF_SENSORS
+
+
+class TariffRecord(object):
+    """The tariff set up for the account, per kWh and supply per day."""
+
+    __slots__ = TARIFF_SENSORS
+
+    def __init__(self, **rates):
+        """Initialize the record, rates not given are None."""
+        for field in self.__slots__:
+            setattr(self, field, rates.pop(field, None))
+        if rates:
+            raise TypeError("Unknown tariff fields: {}".format(", ".join(rates)))
+
+
+class PeriodRecord(object):
+    """The figures of one period view, compared with the period before.
+
+    Fields starting with ``previous_`` describe the comparison period.
+    """
+
+    __slots__ = (
+        "user_type",
+        "usage",
+        "average_net_usage_per_sub_period",
+        "consumption",
+        "consumption_peak",
+        "consumption_offpeak",
+        "consumption_shoulder",
+        "consumption_controlled_load",
+        "generation",
+        "cost_total",
+        "cost_consumption",
+        "cost_generation",
+        "suburb_average",
+        "cost_difference",
+        "difference_message",
+        "percentage_difference",
+        "consumption_difference",
+        "consumption_change",
+        "max_interval",
+        "load_factor",
+        "hourly_profile",
+        "previous_usage",
+        "previous_consumption",
+        "previous_generation",
+    )
+
+    @classmethod
+    def from_json(cls, json_data, granularity=None):
+        """Build the record of a period view's json.
+
+        ``granularity`` is the view's, one of ``GRANULARITIES``.
+        """
+        selected = json_data["selectedPeriod"]
+        net_consumption = selected["netConsumption"]
+        previous_net_consumption = json_data["comparisonPeriod"]["netConsumption"]
+        message = json_data.get("costDifferenceMessage")
+
+        aggregates = aggregate_period(json_data, granularity == ENDPOINT_DAY)
+        consumption = aggregates["consumption"]
+        cost = aggregates["cost"]
+        comparison = aggregates["comparison"]
+
+        usage = (
+            consumption["peak"]
+            + consumption["offpeak"]
+            + consumption["shoulder"]
+            + consumption["controlledLoad"]
+        )
+        cost_consumption = (
+            cost["peak"] + cost["offpeak"] + cost["shoulder"] + cost["controlledLoad"]
+        )
+        previous_usage = (
+            comparison["peak"]
+            + comparison["offpeak"]
+            + comparison["shoulder"]
+            + comparison["controlledLoad"]
+        )
+
+        record = cls()
+        record.user_type = "consumer" if net_consumption > 0 else "generator"
+        record.usage = net_consumption
+        record.average_net_usage_per_sub_period = selected[
+            "averageNetConsumptionPerSubPeriod"
+        ]
+        record.consumption = round(usage, 3)
+        record.consumption_peak = consumption["peak"]
+        record.consumption_offpeak = consumption["offpeak"]
+        record.consumption_shoulder = consumption["shoulder"]
+        record.consumption_controlled_load = consumption["controlledLoad"]
+        record.generation = consumption["generation"]
+        record.cost_total = round(cost_consumption + cost["generation"], 2)
+        record.cost_consumption = round(cost_consumption, 2)
+        record.cost_generation = abs(cost["generation"])
+        record.suburb_average = consumption["suburbAverage"]
+        record.cost_difference = json_data.get("costDifference")
+        record.difference_message = message["text"]
+        record.percentage_difference = json_data.get("kwhPercentageDifference")
+        record.consumption_difference = round(
+            net_consumption - previous_net_consumption, 3
+        )
+        record.consumption_change = message["change"]
+        record.max_interval = aggregates["max_interval"]
+        record.load_factor = aggregates["load_factor"]
+        record.hourly_profile = aggregates["hourly_profile"]
+        record.previous_usage = round(previous_usage - comparison["generation"], 3)
+        record.previous_consumption = round(previous_usage, 3)
+        record.previous_generation = comparison["generation"]
+        return record
+
+
+class OutlookData(object):
+    """Everything a refresh read, a record per endpoint or None if not read."""
+
+    __slots__ = ENDPOINTS
+
+    def __init__(self, **records):
+        """Initialize the data, endpoints not given are None."""
+        for endpoint in self.__slots__:
+            setattr(self, endpoint, records.pop(endpoint, None))
+        if records:
+            raise TypeError("Unknown endpoints: {}".format(", ".join(records)))
+
+    def replace(self, **records):
+        """Return a copy with the given endpoints' records replaced."""
+        current = {endpoint: getattr(self, endpoint) for endpoint in self.__slots__}
+        current.update(records)
+        return OutlookData(**current)
+
+
+def _locate(sensor_type):
+    if sensor_type in TARIFF_SENSORS:
+        return "tariffs", sensor_type
+
+    for endpoint, (current, previous) in PERIOD_PREFIXES.items():
+        if sensor_type.startswith(current):
+            field = sensor_type[len(current) :]
+        elif sensor_type.startswith(previous):
+            field = "previous_" + sensor_type[len(previous) :]
+        else:
+            continue
+        if field in PeriodRecord.__slots__:
+            return endpoint, field
+
+    raise KeyError(sensor_type)
+
+
+def sensor_accessor(sensor_type):
+    """Return the getter of a sensor key such as ``yesterday_usage``.
+
+    ``getter(data)`` returns the sensor's value from an ``OutlookData``, or
+    None while its record has not been read.
+    """
+    endpoint, field = _locate(sensor_type)
+
+    def getter(data):
+        record = getattr(data, endpoint)
+        return None if record is None else getattr(record, field)
+
+    return getter
@@ -0,0 +1,106 @@
+"""Retry backoff, rate limiting and circuit breaking for portal requests."""
+import asyncio
+import random
+import time
+
+
+class RetryPolicy(object):
+    """Exponential backoff with full jitter.
+
+    Retry ``n`` (from 0) waits a random time up to ``base_delay * 2 ** n``
+    seconds, capped at ``max_delay``, so clients that failed together do not
+    come back together.
+    """
+
+    def __init__(self, attempts=3, base_delay=2.0, max_delay=30.0):
+        """Initialize a policy making at most ``attempts`` attempts."""
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry):
+        """Return the seconds to wait before retry ``retry``, None to give up."""
+        if retry + 1 >= self.attempts:
+            return None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class RateLimiter(object):
+    """Space out request starts to at most ``rate`` per second."""
+
+    def __init__(self, rate):
+        """Initialize the limiter, a ``rate`` of None or 0 means no limit."""
+        self._interval = 1.0 / rate if rate else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = loop.time() + self._interval
+
+
+class CircuitBreaker(object):
+    """Stop calling the portal after repeated failures.
+
+    After ``threshold`` failures in a row the circuit opens and calls are
+    refused for ``reset_timeout`` seconds. The first call after that is let
+    through as a trial: success closes the circuit, failure opens it again
+    for twice as long, up to ``max_reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=3, reset_timeout=300.0, max_reset_timeout=3600.0):
+        """Initialize a closed circuit."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self._open_for = reset_timeout
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._trial or time.monotonic() - self._opened_at >= self._open_for:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_after(self):
+        """Return the seconds until an open circuit lets a trial through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_for - time.monotonic())
+
+    def allow(self):
+        """Return True if a call may go ahead now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+        self._open_for = self.reset_timeout
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial:
+            self._open_for = min(self._open_for * 2, self.max_reset_timeout)
+        elif self._opened_at is not None or self.failures < self.threshold:
+            return
+        self._opened_at = time.monotonic()
+        self._trial = False
@@ -0,0 +1,103 @@
+"""Refresh scheduling around the time the portal publishes a day's data."""
+from collections import deque
+from datetime import datetime, time, timedelta
+import hashlib
+import json
+import statistics
+from zoneinfo import ZoneInfo
+
+from .const import PORTAL_TIMEZONE
+
+
+def period_digest(period):
+    """Return a hash of a period's figures, to tell when they change."""
+    encoded = json.dumps(period, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+class PublicationSchedule(object):
+    """Learn when yesterday's figures appear and plan refreshes around it.
+
+    Each probe of the day view is passed to ``observe``. When a probe finds
+    the day complete after an earlier probe found it missing or partial,
+    the time of day is kept as a sample of when the portal publishes; the
+    median of the last ``samples`` samples is the expected publication time.
+
+    Once the day is complete nothing is requested until ``lead`` before the
+    next day's expected publication. Until then the day view is probed every
+    ``probe_interval`` within ``window`` of the expected time and every
+    ``idle_interval`` outside it, or from midnight on while nothing has been
+    learned yet.
+
+    Every planned probe is put back by ``offset``, so that accounts staggered
+    at their first refresh stay apart.
+    """
+
+    def __init__(
+        self,
+        samples=14,
+        lead=timedelta(minutes=30),
+        window=timedelta(hours=2),
+        probe_interval=timedelta(minutes=15),
+        idle_interval=timedelta(hours=1),
+    ):
+        """Initialize a schedule that has not learned anything yet."""
+        self._samples = deque(maxlen=samples)
+        self._lead = lead
+        self.window = window
+        self.offset = timedelta()
+        self._probe_interval = probe_interval
+        self._idle_interval = idle_interval
+        self._tz = ZoneInfo(PORTAL_TIMEZONE)
+        self._day = None
+        self._digest = None
+        self._complete = False
+
+    @property
+    def publication_time(self):
+        """Return the expected publication time as a ``timedelta`` past midnight."""
+        if not self._samples:
+            return None
+        return timedelta(seconds=statistics.median(self._samples))
+
+    def observe(self, now, day, period, complete):
+        """Record a probe at ``now`` of ``day``'s period.
+
+        Returns True if the period changed since the previous probe.
+        """
+        digest = period_digest(period)
+        changed = day != self._day or digest != self._digest
+        if complete and day == self._day and not self._complete:
+            local = now.astimezone(self._tz)
+            midnight = datetime.combine(local.date(), time(), tzinfo=self._tz)
+            self._samples.append((local - midnight).total_seconds())
+
+        self._day = day
+        self._digest = digest
+        self._complete = complete
+        return changed
+
+    def next_update(self, now):
+        """Return how long to wait after ``now`` before the next probe."""
+        # Running the clock ``offset`` behind moves every target time alike.
+        local = (now - self.offset).astimezone(self._tz)
+        midnight = datetime.combine(local.date(), time(), tzinfo=self._tz)
+        published = self.publication_time
+
+        if self._complete:
+            expected = published - self._lead if published is not None else None
+            next_midnight = datetime.combine(
+                local.date() + timedelta(days=1), time(), tzinfo=self._tz
+            )
+            start = next_midnight + (expected or timedelta())
+            return max(start - local, self._probe_interval)
+
+        if published is None:
+            return self._idle_interval
+
+        window_start = midnight + published - self._lead
+        if local < window_start:
+            return max(window_start - local, self._probe_interval)
+        if local < midnight + published + self.window:
+            return self._probe_interval
+        return self._idle_interval
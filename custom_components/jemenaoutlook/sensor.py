@@ -5,22 +5,17 @@ https://electricityoutlook.jemena.com.au/electricityView/index
 For more details about this platform, please refer to the documentation at
 https://github.com/mvandersteen/ha-jemenaoutlook
 """
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 import logging
-from datetime import timedelta
-import json
-
-import re
-from bs4 import BeautifulSoup
-import requests
-
-import locale
-
-import http.client as http_client
+from operator import attrgetter
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA,
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntityDescription,
     SensorStateClass,
@@ -30,994 +25,1053 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_NAME,
     CONF_MONITORED_VARIABLES,
-    ENERGY_KILO_WATT_HOUR,
     CURRENCY_DOLLAR,
     PERCENTAGE,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfTime,
 )
-from homeassistant.helpers.entity import Entity
-from homeassistant.util import Throttle
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 import homeassistant.helpers.config_validation as cv
-
-REQUIREMENTS = ["beautifulsoup4==4.6.0"]
-
-http_client.HTTPConnection.debuglevel = 1
-
-logging.basicConfig(level=logging.DEBUG)
-_LOGGER = logging.getLogger(__name__)
-requests_log = logging.getLogger("requests.packages.urllib3")
-requests_log.setLevel(logging.DEBUG)
-requests_log.propagate = True
-
-MIN_TIME_BETWEEN_UPDATES = timedelta(hours=24)
-SCAN_INTERVAL = timedelta(hours=24)
-
-REQUESTS_TIMEOUT = 15
-
-HOST = "https://electricityoutlook.jemena.com.au"
-HOME_URL = "{}/login/index".format(HOST)
-PERIOD_URL = "{}/electricityView/period".format(HOST)
-
-DEFAULT_NAME = "JemenaOutlook"
-
-SENSOR_TYPES = {
-    "yesterday_user_type": [
-        "Yesterday user type",
-        "type",
-        "mdi:home-account",
-        None,
-        None,
-    ],
-    "yesterday_usage": [
-        "Yesterday usage",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_consumption": [
-        "Yesterday consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_consumption_peak": [
-        "Yesterday consumption peak",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_consumption_offpeak": [
-        "Yesterday consumption offpeak",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_consumption_shoulder": [
-        "Yesterday consumption shoulder",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_consumption_controlled_load": [
-        "Yesterday consumption controlled load",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_generation": [
-        "Yesterday generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_cost_total": [
-        "Yesterday cost total",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "yesterday_cost_consumption": [
-        "Yesterday cost consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "yesterday_cost_generation": [
-        "Yesterday cost generation",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "yesterday_cost_difference": [
-        "Yesterday cost difference",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "yesterday_percentage_difference": [
-        "Yesterday percentage difference",
-        PERCENTAGE,
-        "mdi:percent",
-        None,
-        None,
-    ],
-    "yesterday_difference_message": [
-        "Yesterday difference message",
-        "text",
-        "mdi:clipboard-text",
-        None,
-        None,
-    ],
-    "yesterday_consumption_difference": [
-        "Yesterday consumption difference",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_consumption_change": [
-        "Yesterday consumption change",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:swap-vertical",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "yesterday_suburb_average": [
-        "Yesterday suburb average",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "previous_day_usage": [
-        "Previous day usage",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "previous_day_consumption": [
-        "Previous day consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "previous_day_generation": [
-        "Previous day generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "supply_charge": ["Supply charge", CURRENCY_DOLLAR, "mdi:currency-usd", None, None],
-    "weekday_peak_cost": [
-        "Weekday peak cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "weekday_offpeak_cost": [
-        "Weekday offpeak cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "weekday_shoulder_cost": [
-        "Weekday shoulder cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "controlled_load_cost": [
-        "Controlled load cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "weekend_offpeak_cost": [
-        "Weekend offpeak cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "single_rate_cost": [
-        "Single rate cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "generation_cost": [
-        "Generation cost",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "this_week_user_type": [
-        "This week user type",
-        "type",
-        "mdi:home-account",
-        None,
-        None,
-    ],
-    "this_week_usage": [
-        "This week usage",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_consumption": [
-        "This week consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_consumption_peak": [
-        "This week consumption peak",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_consumption_offpeak": [
-        "This week consumption offpeak",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_consumption_shoulder": [
-        "This week consumption shoulder",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_consumption_controlled_load": [
-        "This week consumption controlled load",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_generation": [
-        "This week generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_cost_total": [
-        "This week cost total",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        SensorStateClass.TOTAL,
-        None,
-    ],
-    "this_week_cost_consumption": [
-        "This week cost consumption",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        SensorStateClass.TOTAL,
-        None,
-    ],
-    "this_week_cost_generation": [
-        "This week cost generation",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "this_week_cost_difference": [
-        "This week cost difference",
-        CURRENCY_DOLLAR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "this_week_percentage_difference": [
-        "This week percentage difference",
-        PERCENTAGE,
-        "mdi:percent",
-        None,
-        None,
-    ],
-    "this_week_difference_message": [
-        "This week difference message",
-        "text",
-        "mdi:clipboard-text",
-        None,
-        None,
-    ],
-    "this_week_consumption_difference": [
-        "This week consumption difference",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_consumption_change": [
-        "This week consumption change",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:swap-vertical",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_week_suburb_average": [
-        "This week suburb average",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.MEASUREMENT,
-        SensorDeviceClass.ENERGY,
-    ],
-    "last_week_usage": [
-        "Last week usage",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "last_week_consumption": [
-        "Last week consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "last_week_generation": [
-        "Last week generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_user_type": [
-        "This month user type",
-        "type",
-        "mdi:home-account",
-        None,
-        None,
-    ],
-    "this_month_usage": [
-        "This month usage",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_consumption": [
-        "This month consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_consumption_peak": [
-        "This month consumption peak",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_consumption_offpeak": [
-        "This month consumption offpeak",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_consumption_shoulder": [
-        "This month consumption shoulder",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-    ],
-    "this_month_consumption_controlled_load": [
-        "This month consumption controlled load",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_generation": [
-        "This month generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_cost_total": [
-        "This month cost total",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:currency-usd",
-        SensorStateClass.TOTAL,
-        None,
-    ],
-    "this_month_cost_consumption": [
-        "This month cost consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:currency-usd",
-        SensorStateClass.TOTAL,
-        None,
-    ],
-    "this_month_cost_generation": [
-        "This month cost generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:currency-usd",
-        SensorStateClass.TOTAL,
-        None,
-    ],
-    "this_month_cost_difference": [
-        "This month cost difference",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:currency-usd",
-        None,
-        None,
-    ],
-    "this_month_percentage_difference": [
-        "This month percentage difference",
-        PERCENTAGE,
-        "mdi:percent",
-        None,
-        None,
-    ],
-    "this_month_difference_message": [
-        "This month difference message",
-        "text",
-        "mdi:clipboard-text",
-        None,
-        None,
-    ],
-    "this_month_consumption_difference": [
-        "This month consumption difference",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_consumption_change": [
-        "This month consumption change",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:swap-vertical",
-        None,
-        SensorDeviceClass.ENERGY,
-    ],
-    "this_month_suburb_average": [
-        "This month suburb average",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.MEASUREMENT,
-        SensorDeviceClass.ENERGY,
-    ],
-    "last_month_usage": [
-        "Last month usage",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "last_month_consumption": [
-        "Last month consumption",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-    "last_month_generation": [
-        "Last month generation",
-        ENERGY_KILO_WATT_HOUR,
-        "mdi:flash",
-        SensorStateClass.TOTAL,
-        SensorDeviceClass.ENERGY,
-    ],
-}
-
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
-    {
-        vol.Required(CONF_MONITORED_VARIABLES): vol.All(
-            cv.ensure_list, [vol.In(SENSOR_TYPES)]
-        ),
-        vol.Required(CONF_USERNAME): cv.string,
-        vol.Required(CONF_PASSWORD): cv.string,
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-    }
+from homeassistant.util import slugify
+
+from .client import required_endpoints
+from .const import (
+    CACHE_CURRENT_PERIOD,
+    CACHE_PAST_PERIOD,
+    CACHE_TARIFFS,
+    CONF_ACCOUNTS,
+    CONF_CACHE_TTL,
+    CONF_DIAGNOSTICS,
+    CONF_PERSIST_SESSION,
+    CONF_ROLLING_WINDOWS,
+    DEFAULT_NAME,
+    DOMAIN,
+    ENDPOINT_DAY,
+    ROLLING_WINDOWS,
 )
+from .coordinator import JemenaOutlookData, cookie_file_path, first_refresh_delay
+from .metrics import STAGES
+from .models import sensor_accessor
+from .services import async_register_services
+from .windows import window_prefix
 
+_LOGGER = logging.getLogger(__name__)
 
-def setup_platform(hass, config, add_devices, discovery_info=None):
-    """Set up the Jemena Outlook sensor."""
-    # Create a data fetcher to support all of the configured sensors. Then make
-    # the first call to init the data.
-
-    username = config.get(CONF_USERNAME)
-    password = config.get(CONF_PASSWORD)
 
-    try:
-        jemenaoutlook_data = JemenaOutlookData(username, password)
-        jemenaoutlook_data.get_data()
+@dataclass(frozen=True, kw_only=True)
+class JemenaOutlookSensorEntityDescription(SensorEntityDescription):
+    """Describes a Jemena Outlook sensor.
 
-    except requests.exceptions.HTTPError as error:
-        _LOGGER.error("Failt login: %s", error)
-        return False
+    ``value_fn`` returns the sensor's value from the coordinator's
+    ``OutlookData``, from the client's ``FetchMetrics`` for diagnostic
+    sensors or from the coordinator's ``RollingWindows`` for rolling window
+    sensors. It is bound once, when the descriptions are built.
+    ``attributes_fn``, if set, returns the sensor's extra state attributes
+    from the same ``OutlookData``.
+    """
 
-    name = config.get(CONF_NAME)
+    value_fn: Callable[[Any], Any] | None = None
+    attributes_fn: Callable[[Any], dict[str, Any]] | None = None
 
-    sensors = []
-    for variable in config[CONF_MONITORED_VARIABLES]:
-        sensors.append(JemenaOutlookSensor(jemenaoutlook_data, variable, name))
 
-    add_devices(sensors)
+def _portal_attributes(**sensor_types):
+    """Return a function reading each attribute as a sensor of that key."""
+    getters = {name: sensor_accessor(key) for name, key in sensor_types.items()}
 
+    def attributes(data):
+        values = {name: getter(data) for name, getter in getters.items()}
+        return {name: value for name, value in values.items() if value is not None}
 
-class JemenaOutlookSensor(Entity):
-    """Implementation of a Jemena Outlook sensor."""
+    return attributes
 
-    def __init__(self, jemenaoutlook_data, sensor_type, name):
-        """Initialize the sensor."""
 
-        self.client_name = name
-        self.type = sensor_type
-        self._name = SENSOR_TYPES[sensor_type][0]
-        self._unit_of_measurement = SENSOR_TYPES[sensor_type][1]
-        self._icon = SENSOR_TYPES[sensor_type][2]
-        self._state_class = SENSOR_TYPES[sensor_type][3]
-        self._device_class = SENSOR_TYPES[sensor_type][4]
-        self.jemenaoutlook_data = jemenaoutlook_data
-        self._state = None
-
-        _LOGGER.info("init data: %s", jemenaoutlook_data.data)
-
-        if (
-            self.type is not None
-            and self.jemenaoutlook_data.data.get(self.type) is not None
-        ):
-            if type(self.jemenaoutlook_data.data[self.type]) == type(""):
-                self._state = self.jemenaoutlook_data.data[self.type]
-            else:
-                self._state = round(self.jemenaoutlook_data.data[self.type], 2)
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return "{} {}".format(self.client_name, self._name)
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
-
-    @property
-    def state_class(self):
-        """
-        Return the state_class of the sensor for energy stats
-        """
-        return self._state_class
-
-    @property
-    def device_class(self):
-        """
-        Return the device_class of the sensor for energy stats
-        """
-        return self._device_class
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement of this entity, if any."""
-        return self._unit_of_measurement
-
-    @property
-    def icon(self):
-        """Icon to use in the frontend, if any."""
-        return self._icon
-
-    def update(self):
-        """Get the latest data from Jemena Outlook and update the state."""
-        self.jemenaoutlook_data.update()
-
-        if self.type in self.jemenaoutlook_data.data is not None:
-            if type(self.jemenaoutlook_data.data[self.type]) == type(""):
-                self._state = self.jemenaoutlook_data.data[self.type]
-            else:
-                self._state = round(self.jemenaoutlook_data.data[self.type], 2)
-
-
-class JemenaOutlookData(object):
-    """Get data from JemenaOutlook."""
-
-    def __init__(self, username, password):
-        """Initialize the data object."""
-        self.client = JemenaOutlookClient(username, password, REQUESTS_TIMEOUT)
-        self.data = {}
-
-    def _fetch_data(self):
-        """Fetch latest data from Jemena Outlook."""
-        try:
-            self.client.fetch_data()
-        except JemenaOutlookError as exp:
-            _LOGGER.error("Error on receive last Jemena Outlook data: %s", exp)
-            return
+def _bind(descriptions, value_fn):
+    """Return the descriptions by key, each with ``value_fn(key)`` bound."""
+    return {
+        description.key: replace(description, value_fn=value_fn(description.key))
+        for description in descriptions
+    }
 
-    def get_data(self):
-        """Return the contract list."""
-        # Fetch data
-        self._fetch_data()
-        self.data = self.client.get_data()
-        return self.data
 
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    def update(self):
-        """Return the latest collected data from Jemena Outlook."""
-        self._fetch_data()
-        self.data = self.client.get_data()
+def _metric_value(key):
+    if key.endswith("_duration"):
+        stage = key[: -len("_duration")]
+        if stage in STAGES:
+            return lambda metrics: metrics.stage_duration(stage)
+    return attrgetter(key)
 
 
-class JemenaOutlookError(Exception):
-    pass
+def _window_value(key):
+    return lambda windows: windows.values().get(key)
 
 
-class JemenaOutlookClient(object):
-    def __init__(self, username, password, timeout=REQUESTS_TIMEOUT):
-        """Initialize the client object."""
-        self.username = username
-        self.password = password
-        self._data = {}
-        self._timeout = timeout
-        self._session = None
+SENSOR_TYPES = _bind(
+    (
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_user_type",
+            name="Yesterday user type",
+            icon="mdi:home-account",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_usage",
+            name="Yesterday usage",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption",
+            name="Yesterday consumption",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+            attributes_fn=_portal_attributes(hourly_profile="yesterday_hourly_profile"),
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption_peak",
+            name="Yesterday consumption peak",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption_offpeak",
+            name="Yesterday consumption offpeak",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption_shoulder",
+            name="Yesterday consumption shoulder",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption_controlled_load",
+            name="Yesterday consumption controlled load",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_generation",
+            name="Yesterday generation",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_cost_total",
+            name="Yesterday cost total",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_cost_consumption",
+            name="Yesterday cost consumption",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_cost_generation",
+            name="Yesterday cost generation",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_cost_difference",
+            name="Yesterday cost difference",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_percentage_difference",
+            name="Yesterday percentage difference",
+            native_unit_of_measurement=PERCENTAGE,
+            icon="mdi:percent",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_difference_message",
+            name="Yesterday difference message",
+            icon="mdi:clipboard-text",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption_difference",
+            name="Yesterday consumption difference",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_consumption_change",
+            name="Yesterday consumption change",
+            icon="mdi:swap-vertical",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_suburb_average",
+            name="Yesterday suburb average",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_max_interval",
+            name="Yesterday max interval",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:chart-bar",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="yesterday_load_factor",
+            name="Yesterday load factor",
+            icon="mdi:chart-bell-curve",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="previous_day_usage",
+            name="Previous day usage",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="previous_day_consumption",
+            name="Previous day consumption",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="previous_day_generation",
+            name="Previous day generation",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="supply_charge",
+            name="Supply charge",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="weekday_peak_cost",
+            name="Weekday peak cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="weekday_offpeak_cost",
+            name="Weekday offpeak cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="weekday_shoulder_cost",
+            name="Weekday shoulder cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="controlled_load_cost",
+            name="Controlled load cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="weekend_offpeak_cost",
+            name="Weekend offpeak cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="single_rate_cost",
+            name="Single rate cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="generation_cost",
+            name="Generation cost",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_user_type",
+            name="This week user type",
+            icon="mdi:home-account",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_usage",
+            name="This week usage",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption",
+            name="This week consumption",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption_peak",
+            name="This week consumption peak",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption_offpeak",
+            name="This week consumption offpeak",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption_shoulder",
+            name="This week consumption shoulder",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption_controlled_load",
+            name="This week consumption controlled load",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_generation",
+            name="This week generation",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_cost_total",
+            name="This week cost total",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            state_class=SensorStateClass.TOTAL,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_cost_consumption",
+            name="This week cost consumption",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            state_class=SensorStateClass.TOTAL,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_cost_generation",
+            name="This week cost generation",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_cost_difference",
+            name="This week cost difference",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_percentage_difference",
+            name="This week percentage difference",
+            native_unit_of_measurement=PERCENTAGE,
+            icon="mdi:percent",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_difference_message",
+            name="This week difference message",
+            icon="mdi:clipboard-text",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption_difference",
+            name="This week consumption difference",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_consumption_change",
+            name="This week consumption change",
+            icon="mdi:swap-vertical",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_suburb_average",
+            name="This week suburb average",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_max_interval",
+            name="This week max interval",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:chart-bar",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_week_load_factor",
+            name="This week load factor",
+            icon="mdi:chart-bell-curve",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_week_usage",
+            name="Last week usage",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_week_consumption",
+            name="Last week consumption",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_week_generation",
+            name="Last week generation",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_user_type",
+            name="This month user type",
+            icon="mdi:home-account",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_usage",
+            name="This month usage",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption",
+            name="This month consumption",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption_peak",
+            name="This month consumption peak",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption_offpeak",
+            name="This month consumption offpeak",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption_shoulder",
+            name="This month consumption shoulder",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption_controlled_load",
+            name="This month consumption controlled load",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_generation",
+            name="This month generation",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_cost_total",
+            name="This month cost total",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            state_class=SensorStateClass.TOTAL,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_cost_consumption",
+            name="This month cost consumption",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            state_class=SensorStateClass.TOTAL,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_cost_generation",
+            name="This month cost generation",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            state_class=SensorStateClass.TOTAL,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_cost_difference",
+            name="This month cost difference",
+            native_unit_of_measurement=CURRENCY_DOLLAR,
+            icon="mdi:currency-usd",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_percentage_difference",
+            name="This month percentage difference",
+            native_unit_of_measurement=PERCENTAGE,
+            icon="mdi:percent",
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_difference_message",
+            name="This month difference message",
+            icon="mdi:clipboard-text",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption_difference",
+            name="This month consumption difference",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_consumption_change",
+            name="This month consumption change",
+            icon="mdi:swap-vertical",
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_suburb_average",
+            name="This month suburb average",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_max_interval",
+            name="This month max interval",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:chart-bar",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="this_month_load_factor",
+            name="This month load factor",
+            icon="mdi:chart-bell-curve",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_month_usage",
+            name="Last month usage",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_month_consumption",
+            name="Last month consumption",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_month_generation",
+            name="Last month generation",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:flash",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        ),
+    ),
+    sensor_accessor,
+)
 
-    def _get_login_page(self):
-        """Go to the login page."""
-        try:
-            raw_res = self._session.get(HOME_URL, timeout=REQUESTS_TIMEOUT)
+# How the last refresh went, read from the client's metrics rather than
+# from the portal data.
+DIAGNOSTIC_TYPES = _bind(
+    (
+        JemenaOutlookSensorEntityDescription(
+            key="refresh_duration",
+            name="Refresh duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            suggested_display_precision=3,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="login_duration",
+            name="Login duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            suggested_display_precision=3,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="tariffs_duration",
+            name="Tariffs duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            suggested_display_precision=3,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="day_duration",
+            name="Day duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            suggested_display_precision=3,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="week_duration",
+            name="Week duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            suggested_display_precision=3,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="month_duration",
+            name="Month duration",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            suggested_display_precision=3,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="refresh_requests",
+            name="Refresh requests",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:swap-horizontal",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="refresh_bytes",
+            name="Refresh bytes",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            icon="mdi:download",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="refresh_retries",
+            name="Refresh retries",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:restart",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        JemenaOutlookSensorEntityDescription(
+            key="last_status",
+            name="Last HTTP status",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:web",
+        ),
+    ),
+    _metric_value,
+)
 
-        except OSError:
-            raise JemenaOutlookError("Can not connect to login page")
 
-        # Get login url
-        soup = BeautifulSoup(raw_res.content, "html.parser")
+def window_descriptions(lengths):
+    """Return the descriptions of the rolling window sensors, by key.
+
+    Rolling figures go up and down as days enter and leave the window, so
+    they have no state class to build long-term statistics from.
+    """
+    descriptions = [
+        JemenaOutlookSensorEntityDescription(
+            key="same_weekday_baseline",
+            name="Same weekday baseline",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            icon="mdi:calendar-week",
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+        )
+    ]
+    for days in lengths:
+        prefix = window_prefix(days)
+        label = "Last {} days".format(days)
+        descriptions += [
+            JemenaOutlookSensorEntityDescription(
+                key=prefix + "consumption",
+                name="{} consumption".format(label),
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                icon="mdi:flash",
+                device_class=SensorDeviceClass.ENERGY,
+                suggested_display_precision=2,
+            ),
+            JemenaOutlookSensorEntityDescription(
+                key=prefix + "cost_total",
+                name="{} cost total".format(label),
+                native_unit_of_measurement=CURRENCY_DOLLAR,
+                icon="mdi:currency-usd",
+                suggested_display_precision=2,
+            ),
+            JemenaOutlookSensorEntityDescription(
+                key=prefix + "daily_average",
+                name="{} daily average".format(label),
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                icon="mdi:flash",
+                device_class=SensorDeviceClass.ENERGY,
+                suggested_display_precision=2,
+            ),
+            JemenaOutlookSensorEntityDescription(
+                key=prefix + "peak_hour_average",
+                name="{} peak hour average".format(label),
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                icon="mdi:flash",
+                device_class=SensorDeviceClass.ENERGY,
+                suggested_display_precision=2,
+            ),
+        ]
+    return _bind(descriptions, _window_value)
 
-        form_node = soup.find("form", {"id": "loginForm"})
-        if form_node is None:
-            raise JemenaOutlookError("No login form found")
 
-        login_url = form_node.attrs.get("action")
-        if login_url is None:
-            raise JemenaOutlookError("Cannot find login url")
+MONITORED_VARIABLES_SCHEMA = vol.All(cv.ensure_list, [vol.In(SENSOR_TYPES)])
 
-        return login_url
+ACCOUNT_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_USERNAME): cv.string,
+        vol.Required(CONF_PASSWORD): cv.string,
+        vol.Optional(CONF_NAME): cv.string,
+        vol.Optional(CONF_MONITORED_VARIABLES): MONITORED_VARIABLES_SCHEMA,
+    }
+)
 
-    def _post_login_page(self, login_url):
-        """Login to Jemena Electricity Outlook website."""
-        form_data = {
-            "login_email": self.username,
-            "login_password": self.password,
-            "submit": "Sign In",
+PLATFORM_SCHEMA = vol.All(
+    cv.has_at_least_one_key(CONF_USERNAME, CONF_ACCOUNTS),
+    PLATFORM_SCHEMA.extend(
+        {
+            vol.Optional(CONF_MONITORED_VARIABLES, default=[]): (
+                MONITORED_VARIABLES_SCHEMA
+            ),
+            vol.Inclusive(CONF_USERNAME, "credentials"): cv.string,
+            vol.Inclusive(CONF_PASSWORD, "credentials"): cv.string,
+            vol.Optional(CONF_ACCOUNTS): vol.All(cv.ensure_list, [ACCOUNT_SCHEMA]),
+            vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+            vol.Optional(CONF_PERSIST_SESSION, default=True): cv.boolean,
+            vol.Optional(CONF_DIAGNOSTICS, default=False): cv.boolean,
+            vol.Optional(CONF_ROLLING_WINDOWS, default=[]): vol.All(
+                cv.ensure_list, [vol.All(vol.Coerce(int), vol.In(ROLLING_WINDOWS))]
+            ),
+            vol.Optional(CONF_CACHE_TTL, default={}): vol.Schema(
+                {
+                    vol.Optional(CACHE_TARIFFS): cv.time_period,
+                    vol.Optional(CACHE_CURRENT_PERIOD): cv.time_period,
+                    vol.Optional(CACHE_PAST_PERIOD): cv.time_period,
+                }
+            ),
         }
-        try:
-            raw_res = self._session.post(
-                "{}/login_security_check".format(HOST),
-                data=form_data,
-                timeout=REQUESTS_TIMEOUT,
-            )
-
-        except OSError as e:
-            raise JemenaOutlookError("Cannot submit login form {0}".format(e.errno))
+    ),
+)
 
-        if raw_res.status_code != 200:
-            raise JemenaOutlookError(
-                "Login error: Bad HTTP status code. {}".format(raw_res.status_code)
-            )
 
-        return True
-
-    def _get_tariffs(self):
-        """Get tariff data. This data must be setup by the user first and is not automatically available."""
-
-        try:
-            url = "{}/electricityView/index".format(HOST)
-            raw_res = self._session.get(url, timeout=REQUESTS_TIMEOUT)
-
-        except OSError:
-            raise JemenaOutlookError("Can not connect to login page")
-
-        # Get login url
-        soup = BeautifulSoup(raw_res.content, "html.parser")
-        tariff_script = soup.find("script", text=re.compile("var tariff = "))
-
-        if tariff_script is not None:
-
-            json_text = re.search(
-                r"^\s*var tariff =\s*({.*?})\s*;\s*$",
-                tariff_script.string,
-                flags=re.DOTALL | re.MULTILINE,
-            ).group(1)
-            data = json.loads(json_text)
-
-            tariff_data = {
-                "supply_charge": self._strip_currency(data["supplyCharge"]),
-                "weekday_peak_cost": self._strip_currency(data["weekdayPeakCost"]),
-                "weekday_offpeak_cost": self._strip_currency(
-                    data["weekdayOffpeakCost"]
-                ),
-                "weekday_shoulder_cost": self._strip_currency(
-                    data["weekdayShoulderCost"]
-                ),
-                "controlled_load_cost": self._strip_currency(
-                    data["controlledLoadCost"]
-                ),
-                "weekend_offpeak_cost": self._strip_currency(
-                    data["weekendOffpeakCost"]
-                ),
-                "single_rate_cost": self._strip_currency(data["singleRateCost"]),
-                "generation_cost": self._strip_currency(data["generationCost"]),
+def _accounts(config):
+    """Return the configured accounts, each with a unique name."""
+    accounts = []
+    if CONF_USERNAME in config:
+        accounts.append(
+            {
+                CONF_USERNAME: config[CONF_USERNAME],
+                CONF_PASSWORD: config[CONF_PASSWORD],
+                CONF_NAME: config[CONF_NAME],
             }
+        )
+    accounts.extend(dict(account) for account in config.get(CONF_ACCOUNTS, []))
+
+    for account in accounts:
+        account.setdefault(CONF_MONITORED_VARIABLES, config[CONF_MONITORED_VARIABLES])
+        if CONF_NAME not in account:
+            account[CONF_NAME] = (
+                config[CONF_NAME]
+                if len(accounts) == 1
+                else "{} {}".format(config[CONF_NAME], account[CONF_USERNAME])
+            )
+    return accounts
 
-        return tariff_data
-
-    def _get_daily_data(self, days_ago):
-        """Get daily data."""
-
-        try:
-            #'{}/electricityView/period/day/1'.format(HOST)
-            url = "{}/{}/{}".format(PERIOD_URL, "day", days_ago)
-            raw_res = self._session.get(url, timeout=REQUESTS_TIMEOUT)
-        except OSError as e:
-            _LOGGER.debug("exception data {}".format(e.errstring))
-            raise JemenaOutlookError("Cannot get daily data")
-        try:
-            json_output = raw_res.json()
-        except (OSError, json.decoder.JSONDecodeError):
-            raise JemenaOutlookError("Could not get daily data: {}".format(raw_res))
-
-        if not json_output.get("selectedPeriod"):
-            raise JemenaOutlookError("Could not get daily data for selectedPeriod")
-
-        _LOGGER.debug("Jemena outlook daily data: %s", json_output)
-
-        daily_data = self._extract_period_data(json_output, "yesterday", "previous_day")
-
-        return daily_data
-
-    def _get_weekly_data(self, weeks_ago):
-        """Get weekly data."""
-
-        try:
-            # PERIOD_URL
-            url = "{}/{}/{}".format(PERIOD_URL, "week", weeks_ago)
-            raw_res = self._session.get(url, timeout=REQUESTS_TIMEOUT)
-
-        except OSError as e:
-            _LOGGER.debug("exception data {}".format(e.errstring))
-            raise JemenaOutlookError("Cannot get daily data")
-        try:
-            json_output = raw_res.json()
-
-        except (OSError, json.decoder.JSONDecodeError):
-            raise JemenaOutlookError("Could not get daily data: {}".format(raw_res))
-
-        if not json_output.get("selectedPeriod"):
-            raise JemenaOutlookError("Could not get daily data for selectedPeriod")
-
-        _LOGGER.debug("Jemena outlook weekly data: %s", json_output)
 
-        weekly_data = self._extract_period_data(json_output, "this_week", "last_week")
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the Jemena Outlook sensor."""
+    # Create a data fetcher for each account to support all of its configured
+    # sensors. Sensors start from their last known state and nothing is
+    # fetched until Home Assistant has started; then the first account is
+    # refreshed straight away and the others are staggered so the accounts
+    # never hit the portal at the same moment.
+
+    cache_ttls = {
+        page: ttl.total_seconds() for page, ttl in config[CONF_CACHE_TTL].items()
+    }
 
-        return weekly_data
+    for index, account in enumerate(_accounts(config)):
+        username = account[CONF_USERNAME]
+        name = account[CONF_NAME]
+        monitored_variables = account[CONF_MONITORED_VARIABLES]
+
+        # A dedicated session keeps each account's login cookies apart while
+        # all of them share Home Assistant's connection pool.
+        session = async_create_clientsession(hass)
+
+        cookie_file = None
+        if config.get(CONF_PERSIST_SESSION):
+            cookie_file = cookie_file_path(hass, username)
+
+        # Only request the pages the monitored variables are actually read
+        # from, and the day view that fills the rolling windows.
+        endpoints = required_endpoints(monitored_variables)
+        if config[CONF_ROLLING_WINDOWS]:
+            endpoints.add(ENDPOINT_DAY)
+
+        jemenaoutlook_data = JemenaOutlookData(
+            hass,
+            session,
+            username,
+            account[CONF_PASSWORD],
+            name,
+            cookie_file,
+            endpoints,
+            cache_ttls,
+            rolling_windows=config[CONF_ROLLING_WINDOWS],
+        )
+        await jemenaoutlook_data.client.async_load_session()
+        jemenaoutlook_data.async_schedule_first_refresh(first_refresh_delay(index))
 
-    def _get_monthly_data(self, months_ago):
-        """Get weekly data."""
+        hass.data.setdefault(DOMAIN, {})[name] = jemenaoutlook_data
 
-        try:
-            # PERIOD_URL
-            url = "{}/{}/{}".format(PERIOD_URL, "month", months_ago)
-            raw_res = self._session.get(url, timeout=REQUESTS_TIMEOUT)
+        async_add_entities(
+            JemenaOutlookSensor(jemenaoutlook_data, SENSOR_TYPES[variable], name)
+            for variable in monitored_variables
+        )
+        if config[CONF_DIAGNOSTICS]:
+            async_add_entities(
+                JemenaOutlookDiagnosticSensor(jemenaoutlook_data, description, name)
+                for description in DIAGNOSTIC_TYPES.values()
+            )
+        if jemenaoutlook_data.windows is not None:
+            async_add_entities(
+                JemenaOutlookWindowSensor(jemenaoutlook_data, description, name)
+                for description in window_descriptions(
+                    jemenaoutlook_data.windows.lengths
+                ).values()
+            )
 
-        except OSError as e:
-            _LOGGER.debug("exception data {}".format(e.errstring))
-            raise JemenaOutlookError("Cannot get daily data")
-        try:
-            json_output = raw_res.json()
+    async_register_services(hass)
 
-        except (OSError, json.decoder.JSONDecodeError):
-            raise JemenaOutlookError("Could not get daily data: {}".format(raw_res))
 
-        if not json_output.get("selectedPeriod"):
-            raise JemenaOutlookError("Could not get daily data for selectedPeriod")
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the sensors of an account added through the UI.
 
-        _LOGGER.debug("Jemena outlook monthly data: %s", json_output)
+    Every sensor read from the tariffs and the enabled period views is
+    created, with the enabled rolling windows when the day view is read;
+    sensors no longer enabled are removed.
+    """
+    jemenaoutlook_data = hass.data[DOMAIN][entry.data[CONF_NAME]]
+    username = entry.data[CONF_USERNAME]
+    endpoints = jemenaoutlook_data.client.endpoints
 
-        monthly_data = self._extract_period_data(
-            json_output, "this_month", "last_month"
+    sensors = [
+        JemenaOutlookSensor(
+            jemenaoutlook_data,
+            description,
+            entry.data[CONF_NAME],
+            "{}_{}".format(slugify(username), key),
+        )
+        for key, description in SENSOR_TYPES.items()
+        if required_endpoints((key,)) <= endpoints
+    ]
+    if jemenaoutlook_data.windows is not None:
+        sensors.extend(
+            JemenaOutlookWindowSensor(
+                jemenaoutlook_data,
+                description,
+                entry.data[CONF_NAME],
+                "{}_{}".format(slugify(username), key),
+            )
+            for key, description in window_descriptions(
+                jemenaoutlook_data.windows.lengths
+            ).items()
         )
 
-        return monthly_data
+    unique_ids = {sensor.unique_id for sensor in sensors}
+    registry = er.async_get(hass)
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if registry_entry.unique_id not in unique_ids:
+            registry.async_remove(registry_entry.entity_id)
 
-    def _extract_period_data(self, json_data, current, previous):
+    async_add_entities(sensors)
 
-        costDifference = json_data.get("costDifference")
-        costDifferenceMessage = json_data.get("costDifferenceMessage")
-        kwhPercentageDifference = json_data.get("kwhPercentageDifference")
 
-        consumptionDifference = json_data.get("consumptionDifferenceMessage")
+class JemenaOutlookSensor(CoordinatorEntity, RestoreSensor):
+    """Implementation of a Jemena Outlook sensor.
 
-        selectedPeriod = json_data.get("selectedPeriod")
+    Until the first refresh after a restart the sensor shows the state it
+    had before.
+    """
 
-        netConsumption = selectedPeriod["netConsumption"]
-        averageNetConsumptionPerSubPeriod = selectedPeriod[
-            "averageNetConsumptionPerSubPeriod"
-        ]
-        peakConsumption = self._sum_period_array(
-            selectedPeriod["consumptionData"]["peak"], 3
-        )
-        offPeakConsumption = self._sum_period_array(
-            selectedPeriod["consumptionData"]["offpeak"], 3
-        )
-        shoulderConsumption = self._sum_period_array(
-            selectedPeriod["consumptionData"]["shoulder"], 3
-        )
-        controlledLoadConsumption = self._sum_period_array(
-            selectedPeriod["consumptionData"]["controlledLoad"], 3
-        )
-        generation = self._sum_period_array(
-            selectedPeriod["consumptionData"]["generation"], 3
-        )
-        suburbAverage = self._sum_period_array(
-            selectedPeriod["consumptionData"]["suburbAverage"], 3
-        )
+    entity_description: JemenaOutlookSensorEntityDescription
+    restore = True
 
-        costDataPeak = self._sum_period_array(selectedPeriod["costData"]["peak"], 2)
-        costDataOffPeak = self._sum_period_array(
-            selectedPeriod["costData"]["offpeak"], 2
-        )
-        costDataShoulder = self._sum_period_array(
-            selectedPeriod["costData"]["shoulder"], 2
-        )
-        costDataControlledLoad = self._sum_period_array(
-            selectedPeriod["costData"]["controlledLoad"], 2
-        )
-        costDataGeneration = self._sum_period_array(
-            selectedPeriod["costData"]["generation"], 2
-        )
+    def __init__(self, jemenaoutlook_data, description, name, unique_id=None):
+        """Initialize the sensor."""
+        super().__init__(jemenaoutlook_data)
 
-        previousPeriod = json_data.get("comparisonPeriod")
+        self.entity_description = description
+        self._attr_name = "{} {}".format(name, description.name)
+        self._attr_unique_id = unique_id
 
-        previousPeriodNetConsumption = previousPeriod["netConsumption"]
-        previousPeriodPeakConsumption = self._sum_period_array(
-            previousPeriod["consumptionData"]["peak"], 3
-        )
-        previousPeriodOffPeakConsumption = self._sum_period_array(
-            previousPeriod["consumptionData"]["offpeak"], 3
-        )
-        previousPeriodShoulderConsumption = self._sum_period_array(
-            previousPeriod["consumptionData"]["shoulder"], 3
-        )
-        previousPeriodControlledLoadConsumption = self._sum_period_array(
-            previousPeriod["consumptionData"]["controlledLoad"], 3
-        )
-        previousPeriodGeneration = self._sum_period_array(
-            previousPeriod["consumptionData"]["generation"], 3
-        )
-        previousPeriodSuburbAverage = self._sum_period_array(
-            previousPeriod["consumptionData"]["suburbAverage"], 3
-        )
+        self._update_state()
 
-        period_data = {
-            current + "_user_type": "consumer" if netConsumption > 0 else "generator",
-            current + "_usage": netConsumption,
-            current
-            + "_average_net_usage_per_sub_period": averageNetConsumptionPerSubPeriod,
-            current
-            + "_consumption": round(
-                peakConsumption
-                + offPeakConsumption
-                + shoulderConsumption
-                + controlledLoadConsumption,
-                3,
-            ),
-            current + "_consumption_peak": peakConsumption,
-            current + "_consumption_offpeak": offPeakConsumption,
-            current + "_consumption_shoulder": shoulderConsumption,
-            current + "_consumption_controlled_load": controlledLoadConsumption,
-            current + "_generation": generation,
-            current
-            + "_cost_total": round(
-                costDataPeak
-                + costDataOffPeak
-                + costDataShoulder
-                + costDataControlledLoad
-                + costDataGeneration,
-                2,
-            ),
-            current
-            + "_cost_consumption": round(
-                costDataPeak
-                + costDataOffPeak
-                + costDataShoulder
-                + costDataControlledLoad,
-                2,
-            ),
-            current + "_cost_generation": abs(costDataGeneration),
-            current + "_suburb_average": suburbAverage,
-            current + "_cost_difference": costDifference,
-            current + "_difference_message": costDifferenceMessage["text"],
-            current + "_percentage_difference": kwhPercentageDifference,
-            current
-            + "_consumption_difference": round(
-                netConsumption - previousPeriodNetConsumption, 3
-            ),
-            current + "_consumption_change": costDifferenceMessage["change"],
-            previous
-            + "_usage": round(
-                previousPeriodPeakConsumption
-                + previousPeriodOffPeakConsumption
-                + previousPeriodShoulderConsumption
-                + previousPeriodControlledLoadConsumption
-                - previousPeriodGeneration,
-                3,
-            ),
-            previous
-            + "_consumption": round(
-                previousPeriodPeakConsumption
-                + previousPeriodOffPeakConsumption
-                + previousPeriodShoulderConsumption
-                + previousPeriodControlledLoadConsumption,
-                3,
-            ),
-            previous + "_generation": previousPeriodGeneration,
-        }
-        return period_data
+    def _update_state(self):
+        """Read this sensor's value from the shared coordinator data."""
+        data = self.coordinator.data
+        if data is None:
+            return
 
-    def _sum_period_array(self, json_array_of_value, rounding_digits):
-        total_value = 0.0
-        for value in json_array_of_value:
-            if value is not None:
-                total_value += value
-        return round(total_value, rounding_digits)
+        value = self.entity_description.value_fn(data)
+        if value is not None:
+            self._attr_native_value = value
+        if self.entity_description.attributes_fn is not None:
+            self._attr_extra_state_attributes = self.entity_description.attributes_fn(
+                data
+            )
 
-    def _strip_currency(self, amount):
+    async def async_added_to_hass(self):
+        """Restore the last state unless data has already been fetched."""
+        await super().async_added_to_hass()
+        if not self.restore or self._attr_native_value is not None:
+            return
 
-        return locale.atof(amount.strip("$"))
+        last_data = await self.async_get_last_sensor_data()
+        if last_data is not None:
+            self._attr_native_value = last_data.native_value
 
-    def fetch_data(self):
-        """Get the latest data from Jemena Outlook."""
+    @callback
+    def _handle_coordinator_update(self):
+        """Write the new state as soon as the coordinator has fresh data."""
+        self._update_state()
+        self.async_write_ha_state()
 
-        # setup requests session
-        self._session = requests.Session()
 
-        # Get login page
-        login_url = self._get_login_page()
+class JemenaOutlookDiagnosticSensor(JemenaOutlookSensor):
+    """A timing or request count of an account's last refresh."""
 
-        # Post login page
-        self._post_login_page(login_url)
+    restore = False
 
-        self._data.update(self._get_tariffs())
+    def _update_state(self):
+        """Read this sensor's value from the client's refresh metrics."""
+        self._attr_native_value = self.entity_description.value_fn(
+            self.coordinator.client.metrics
+        )
 
-        # Get Daily Usage data
-        self._data.update(self._get_daily_data(1))
 
-        # Get Daily Usage data
-        self._data.update(self._get_weekly_data(0))
+class JemenaOutlookWindowSensor(JemenaOutlookSensor):
+    """A rolling window figure, computed from the account's stored days."""
 
-        # Get Daily Usage data
-        self._data.update(self._get_monthly_data(0))
+    def _update_state(self):
+        """Read this sensor's value from the coordinator's rolling windows.
 
-    def get_data(self):
-        return self._data
+        The value is cleared while the windows lag behind the latest day due.
+        """
+        self._attr_native_value = self.entity_description.value_fn(
+            self.coordinator.windows
+        )
@@ -0,0 +1,210 @@
+"""Services for the Jemena Outlook integration."""
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+
+import homeassistant.helpers.config_validation as cv
+
+from .client import portal_today
+from .const import (
+    ATTR_ACCOUNT,
+    ATTR_CONCURRENCY,
+    ATTR_CONTROLLED_LOAD_RATE,
+    ATTR_DAYS,
+    ATTR_ENABLED,
+    ATTR_END,
+    ATTR_GENERATION_RATE,
+    ATTR_MAX_BYTES,
+    ATTR_PATH,
+    ATTR_RATE,
+    ATTR_RATES,
+    ATTR_SAMPLE_RATE,
+    ATTR_START,
+    ATTR_SUPPLY_CHARGE,
+    ATTR_TARIFFS,
+    DEFAULT_BACKFILL_CONCURRENCY,
+    DEFAULT_BACKFILL_RATE,
+    DEFAULT_COMPARE_DAYS,
+    DOMAIN,
+    METRICS_FILE,
+    SERVICE_BACKFILL,
+    SERVICE_COMPARE_TARIFFS,
+    SERVICE_DUMP_METRICS,
+    SERVICE_SET_TRACING,
+)
+from .metrics import prometheus_text
+from .tariff import ALL_DAYS, WEEKDAYS, WEEKENDS, RateWindow, Tariff
+from .tracing import DEFAULT_MAX_BYTES, DEFAULT_SAMPLE_RATE
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DAYS): vol.All(vol.Coerce(int), vol.Range(min=1, max=3660)),
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_BACKFILL_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=16)
+        ),
+        vol.Optional(ATTR_RATE, default=DEFAULT_BACKFILL_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_ACCOUNT): cv.string,
+    }
+)
+
+DUMP_METRICS_SCHEMA = vol.Schema({vol.Optional(ATTR_PATH): cv.string})
+
+SET_TRACING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_SAMPLE_RATE, default=DEFAULT_SAMPLE_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional(ATTR_MAX_BYTES, default=DEFAULT_MAX_BYTES): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_ACCOUNT): cv.string,
+    }
+)
+
+DAY_SETS = {"all": ALL_DAYS, "weekdays": WEEKDAYS, "weekends": WEEKENDS}
+
+HOUR = vol.All(vol.Coerce(float), vol.Range(min=0, max=24))
+
+RATE_WINDOW_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_RATE): vol.Coerce(float),
+        vol.Optional(ATTR_START, default=0): HOUR,
+        vol.Optional(ATTR_END, default=24): HOUR,
+        vol.Optional(ATTR_DAYS, default="all"): vol.In(DAY_SETS),
+    }
+)
+
+TARIFF_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Optional(ATTR_SUPPLY_CHARGE, default=0): vol.Coerce(float),
+        vol.Required(ATTR_RATES): vol.All(
+            cv.ensure_list, [RATE_WINDOW_SCHEMA], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_CONTROLLED_LOAD_RATE): vol.Coerce(float),
+        vol.Optional(ATTR_GENERATION_RATE, default=0): vol.Coerce(float),
+    }
+)
+
+COMPARE_TARIFFS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START): cv.date,
+        vol.Optional(ATTR_END): cv.date,
+        vol.Optional(ATTR_TARIFFS, default=[]): vol.All(
+            cv.ensure_list, [TARIFF_SCHEMA]
+        ),
+        vol.Optional(ATTR_ACCOUNT): cv.string,
+    }
+)
+
+
+def _tariff(config):
+    """Return the ``Tariff`` described in a compare_tariffs call."""
+    return Tariff(
+        config[CONF_NAME],
+        config[ATTR_SUPPLY_CHARGE],
+        [
+            RateWindow(
+                window[ATTR_RATE],
+                window[ATTR_START],
+                window[ATTR_END],
+                DAY_SETS[window[ATTR_DAYS]],
+            )
+            for window in config[ATTR_RATES]
+        ],
+        controlled_load_rate=config.get(ATTR_CONTROLLED_LOAD_RATE),
+        generation_rate=config[ATTR_GENERATION_RATE],
+    )
+
+
+def _coordinators(hass, call):
+    """Return the coordinators a service call applies to."""
+    coordinators = hass.data.get(DOMAIN, {})
+    account = call.data.get(ATTR_ACCOUNT)
+    if account is None:
+        return list(coordinators.values())
+    return [c for name, c in coordinators.items() if name == account]
+
+
+def async_register_services(hass):
+    """Register the integration services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_BACKFILL):
+        return
+
+    async def async_backfill(call):
+        for coordinator in _coordinators(hass, call):
+            await coordinator.backfill.async_run(
+                call.data[ATTR_DAYS], call.data[ATTR_CONCURRENCY], call.data[ATTR_RATE]
+            )
+
+    async def async_dump_metrics(call):
+        path = call.data.get(ATTR_PATH)
+        if path is None:
+            path = hass.config.path(METRICS_FILE)
+        elif not hass.config.is_allowed_path(path):
+            raise HomeAssistantError("Cannot write metrics to {}".format(path))
+
+        text = prometheus_text(
+            {name: c.client.metrics for name, c in hass.data.get(DOMAIN, {}).items()}
+        )
+
+        def _write():
+            with open(path, "w") as f:
+                f.write(text)
+
+        await hass.async_add_executor_job(_write)
+
+    async def async_compare_tariffs(call):
+        end = call.data.get(ATTR_END, portal_today() - timedelta(days=1))
+        start = call.data.get(
+            ATTR_START, end - timedelta(days=DEFAULT_COMPARE_DAYS - 1)
+        )
+        tariffs = [_tariff(tariff) for tariff in call.data[ATTR_TARIFFS]]
+
+        accounts = {}
+        for coordinator in _coordinators(hass, call):
+            try:
+                breakdowns = await coordinator.async_compare_tariffs(
+                    start, end, tariffs
+                )
+            except ValueError as e:
+                raise HomeAssistantError(str(e)) from e
+            accounts[coordinator.name] = [b.as_dict() for b in breakdowns]
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "accounts": accounts,
+        }
+
+    async def async_set_tracing(call):
+        for coordinator in _coordinators(hass, call):
+            coordinator.client.tracer.configure(
+                call.data[ATTR_ENABLED],
+                call.data[ATTR_SAMPLE_RATE],
+                call.data[ATTR_MAX_BYTES],
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_backfill, schema=BACKFILL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DUMP_METRICS, async_dump_metrics, schema=DUMP_METRICS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_TRACING, async_set_tracing, schema=SET_TRACING_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPARE_TARIFFS,
+        async_compare_tariffs,
+        schema=COMPARE_TARIFFS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,32 @@
+"""Share one in-progress call among concurrent callers."""
+import asyncio
+
+
+class SingleFlight(object):
+    """Run a coroutine function once for every caller that overlaps it.
+
+    A caller arriving while a run is in progress awaits that run instead of
+    starting another, and gets its result or exception. A cancelled caller
+    does not cancel the run for the others.
+    """
+
+    def __init__(self):
+        """Initialize with nothing in flight."""
+        self._task = None
+
+    @property
+    def in_flight(self):
+        return self._task is not None
+
+    def _done(self, task):
+        self._task = None
+        # Callers that were all cancelled leave the exception unretrieved.
+        if not task.cancelled():
+            task.exception()
+
+    async def run(self, func):
+        """Return the result of ``func()``, shared with overlapping callers."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(func())
+            self._task.add_done_callback(self._done)
+        return await asyncio.shield(self._task)
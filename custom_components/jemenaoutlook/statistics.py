@@ -0,0 +1,131 @@
+"""Import Jemena Outlook interval data into Home Assistant long-term statistics."""
+from datetime import datetime, time, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import CONSUMPTION_CHANNELS, DOMAIN, PORTAL_TIMEZONE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_id(account, channel):
+    """Return the external statistic id for one consumption channel."""
+    return "{}:{}_{}".format(DOMAIN, slugify(account), CONSUMPTION_CHANNELS[channel])
+
+
+def hourly_values(day, intervals):
+    """Bucket one day's interval readings into UTC hours.
+
+    The portal returns a fixed number of equal intervals per local day, so
+    the interval length follows from the day's length, which also covers the
+    23 and 25 hour days at daylight saving changes. Returns a list of
+    ``(hour_start, kwh)`` with hours that only had missing readings left out.
+    """
+    tz = dt_util.get_time_zone(PORTAL_TIMEZONE)
+    start = datetime.combine(day, time(), tzinfo=tz).astimezone(dt_util.UTC)
+    end = datetime.combine(day + timedelta(days=1), time(), tzinfo=tz).astimezone(
+        dt_util.UTC
+    )
+    if not intervals:
+        return []
+    step = (end - start) / len(intervals)
+
+    hours = {}
+    for index, value in enumerate(intervals):
+        if value is None:
+            continue
+        hour = (start + step * index).replace(minute=0, second=0, microsecond=0)
+        hours[hour] = hours.get(hour, 0.0) + value
+
+    return sorted(hours.items())
+
+
+async def async_import_days(hass, account, name, days, initial_sums=None, since=None):
+    """Import hourly statistics for each consumption channel.
+
+    ``days`` maps ``datetime.date`` to the day's ``consumptionData`` dict.
+    Sums run on from ``initial_sums`` (per channel, default 0) in date order.
+    Hours up to and including ``since`` (per channel, default none) are
+    left out, they have been imported before.
+    """
+    initial_sums = initial_sums or {}
+    since = since or {}
+
+    for channel in CONSUMPTION_CHANNELS:
+        total = initial_sums.get(channel, 0.0)
+        last_hour = since.get(channel)
+        statistics = []
+        for day in sorted(days):
+            for hour, value in hourly_values(day, days[day].get(channel) or []):
+                if last_hour is not None and hour <= last_hour:
+                    continue
+                total += value
+                statistics.append(
+                    StatisticData(start=hour, state=round(value, 3), sum=total)
+                )
+
+        if not statistics:
+            continue
+
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name="{} {}".format(name, CONSUMPTION_CHANNELS[channel].replace("_", " ")),
+            source=DOMAIN,
+            statistic_id=statistic_id(account, channel),
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+        _LOGGER.debug("Importing %d hours of %s statistics", len(statistics), channel)
+        async_add_external_statistics(hass, metadata, statistics)
+
+
+def _last_statistics(hass, account):
+    last = {}
+    for channel in CONSUMPTION_CHANNELS:
+        stat_id = statistic_id(account, channel)
+        rows = get_last_statistics(hass, 1, stat_id, True, {"sum"}).get(stat_id)
+        if not rows:
+            continue
+        start = rows[0]["start"]
+        if isinstance(start, (int, float)):
+            start = dt_util.utc_from_timestamp(start)
+        last[channel] = (start, rows[0]["sum"] or 0.0)
+    return last
+
+
+async def async_import_new_days(hass, account, name, store):
+    """Import the stored days not yet in statistics, continuing their sums.
+
+    Only the hours after each channel's last imported statistic are added,
+    so a refresh that stored one more day imports just that day. Without
+    any statistics yet every stored day is imported.
+    """
+    last = await get_instance(hass).async_add_executor_job(
+        _last_statistics, hass, account
+    )
+
+    start = None
+    if last:
+        tz = dt_util.get_time_zone(PORTAL_TIMEZONE)
+        start = min(hour for hour, _ in last.values()).astimezone(tz).date()
+
+    days = await store.async_get_days(account, start)
+    if not days:
+        return
+
+    await async_import_days(
+        hass,
+        account,
+        name,
+        {day: period["consumptionData"] for day, (period, _) in days.items()},
+        {channel: total for channel, (_, total) in last.items()},
+        {channel: hour for channel, (hour, _) in last.items()},
+    )
@@ -0,0 +1,182 @@
+"""
+Local store of daily interval data for the Jemena Outlook integration.
+
+Each stored day keeps the day view's ``consumptionData`` and ``costData``
+arrays packed as doubles (NaN for missing readings) in one SQLite row, so a
+day that has been fetched once never needs to be downloaded again.
+"""
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import asyncio
+import json
+import math
+import sqlite3
+
+from .const import CONSUMPTION_KEYS, COST_KEYS
+
+# Top level fields of the day view that compare the day with the one before.
+DIFFERENCE_KEYS = (
+    "costDifference",
+    "costDifferenceMessage",
+    "kwhPercentageDifference",
+    "consumptionDifferenceMessage",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day (
+    account TEXT NOT NULL,
+    day TEXT NOT NULL,
+    intervals INTEGER NOT NULL,
+    net_consumption REAL,
+    average_net_consumption REAL,
+    consumption BLOB NOT NULL,
+    cost BLOB NOT NULL,
+    differences TEXT,
+    PRIMARY KEY (account, day)
+)
+"""
+
+# Keep the differences already stored for a day when it is written again
+# as another day's comparison period, which carries none.
+_UPSERT = """
+INSERT INTO day VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (account, day) DO UPDATE SET
+    intervals = excluded.intervals,
+    net_consumption = excluded.net_consumption,
+    average_net_consumption = excluded.average_net_consumption,
+    consumption = excluded.consumption,
+    cost = excluded.cost,
+    differences = COALESCE(excluded.differences, day.differences)
+"""
+
+
+def is_complete(period):
+    """Return True if every interval of a period has a reading.
+
+    Days are only worth keeping once the portal has published all of them;
+    a day fetched too early would otherwise be stored half empty.
+    """
+    channels = [period["consumptionData"][key] for key in CONSUMPTION_KEYS[:5]]
+    if not channels[0]:
+        return False
+    return all(any(v is not None for v in values) for values in zip(*channels))
+
+
+def _pack(data, keys, intervals):
+    packed = array("d")
+    for key in keys:
+        values = data.get(key) or [None] * intervals
+        packed.extend(math.nan if v is None else v for v in values)
+    return packed.tobytes()
+
+
+def _unpack(blob, keys, intervals):
+    values = array("d")
+    values.frombytes(blob)
+    return {
+        key: [
+            None if math.isnan(v) else v
+            for v in values[index * intervals : (index + 1) * intervals]
+        ]
+        for index, key in enumerate(keys)
+    }
+
+
+class IntervalStore(object):
+    """SQLite store of interval data, keyed by account and date.
+
+    All database work runs on one dedicated thread, the ``async_`` methods
+    can be awaited from the event loop.
+    """
+
+    def __init__(self, path):
+        """Initialize the store, the database is opened on first use."""
+        self._path = path
+        self._conn = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="jemenaoutlook_store"
+        )
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def put_day(self, account, day, period, differences=None):
+        """Store one day's period, as found in a day view's json."""
+        intervals = len(period["consumptionData"]["peak"])
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                _UPSERT,
+                (
+                    account,
+                    day.isoformat(),
+                    intervals,
+                    period.get("netConsumption"),
+                    period.get("averageNetConsumptionPerSubPeriod"),
+                    _pack(period["consumptionData"], CONSUMPTION_KEYS, intervals),
+                    _pack(period["costData"], COST_KEYS, intervals),
+                    json.dumps(differences) if differences is not None else None,
+                ),
+            )
+
+    def get_days(self, account, start=None, end=None):
+        """Return ``{date: (period, differences)}`` for stored days.
+
+        ``start`` and ``end`` optionally bound the dates, both inclusive.
+        """
+        query = "SELECT * FROM day WHERE account = ?"
+        args = [account]
+        if start is not None:
+            query += " AND day >= ?"
+            args.append(start.isoformat())
+        if end is not None:
+            query += " AND day <= ?"
+            args.append(end.isoformat())
+
+        days = {}
+        for row in self._connection().execute(query, args):
+            _, day, intervals, net, average, consumption, cost, differences = row
+            period = {
+                "netConsumption": net,
+                "averageNetConsumptionPerSubPeriod": average,
+                "consumptionData": _unpack(consumption, CONSUMPTION_KEYS, intervals),
+                "costData": _unpack(cost, COST_KEYS, intervals),
+            }
+            days[date.fromisoformat(day)] = (
+                period,
+                json.loads(differences) if differences is not None else None,
+            )
+        return days
+
+    def stored_days(self, account):
+        """Return the set of dates stored for an account."""
+        rows = self._connection().execute(
+            "SELECT day FROM day WHERE account = ?", (account,)
+        )
+        return {date.fromisoformat(row[0]) for row in rows}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def async_put_day(self, account, day, period, differences=None):
+        await self._run(self.put_day, account, day, period, differences)
+
+    async def async_get_days(self, account, start=None, end=None):
+        return await self._run(self.get_days, account, start, end)
+
+    async def async_stored_days(self, account):
+        return await self._run(self.stored_days, account)
+
+    async def async_close(self):
+        await self._run(self.close)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,258 @@
+"""
+Local pricing of interval consumption under a tariff.
+
+Days read from the interval store are priced without asking the portal for
+their costs, under the account's own tariff or any other one, which makes
+it cheap to compare what a period would have cost on other tariffs.
+
+The account's tariff is applied to the portal's own split of usage into
+peak, shoulder and off peak. Other tariffs describe their rates as
+time-of-use windows instead, and usage is split by the time of day each
+interval starts.
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .const import CONSUMPTION_KEYS, PORTAL_TIMEZONE
+
+WEEKDAYS = frozenset(range(5))
+WEEKENDS = frozenset((5, 6))
+ALL_DAYS = WEEKDAYS | WEEKENDS
+
+# Rows of a day's readings, as in CONSUMPTION_KEYS.
+_PEAK, _OFFPEAK, _SHOULDER, _CONTROLLED_LOAD, _GENERATION = range(5)
+
+
+class RateWindow(object):
+    """A rate per kWh charged from ``start`` to ``end`` o'clock on ``days``.
+
+    ``days`` holds weekday numbers, Monday being 0.
+    """
+
+    __slots__ = ("rate", "start", "end", "days")
+
+    def __init__(self, rate, start=0, end=24, days=ALL_DAYS):
+        """Initialize the window, hours may have fractions."""
+        self.rate = rate
+        self.start = start
+        self.end = end
+        self.days = frozenset(days)
+
+
+class Tariff(object):
+    """A retail electricity tariff.
+
+    ``supply_charge`` is charged per day. Usage other than controlled load is
+    priced by ``windows``, the first window covering an interval's start
+    giving its rate, or when ``band_rates`` is given by the portal's own
+    split into ``peak``, ``shoulder`` and ``offpeak`` with
+    ``weekend_offpeak`` for off peak on weekends. Controlled load is priced
+    at ``controlled_load_rate``, like other usage when None, and generation
+    is credited at ``generation_rate``.
+    """
+
+    def __init__(
+        self,
+        name,
+        supply_charge=0.0,
+        windows=(),
+        band_rates=None,
+        controlled_load_rate=None,
+        generation_rate=0.0,
+    ):
+        """Initialize the tariff, rates in dollars per kWh."""
+        if not windows and band_rates is None:
+            raise ValueError("Tariff {} has no rates".format(name))
+        self.name = name
+        self.supply_charge = supply_charge
+        self.windows = tuple(windows)
+        self.band_rates = band_rates
+        self.controlled_load_rate = controlled_load_rate
+        self.generation_rate = generation_rate
+        self._rates = {}
+
+    @classmethod
+    def from_record(cls, record, name="current"):
+        """Return the account's tariff, from the portal's ``TariffRecord``.
+
+        Accounts on a single rate have no peak rate; all their usage is
+        charged the single rate.
+        """
+        if record.weekday_peak_cost is None and record.single_rate_cost is None:
+            raise ValueError("No tariff has been set up for the account")
+        if record.weekday_peak_cost is None:
+            windows = (RateWindow(record.single_rate_cost),)
+            band_rates = None
+        else:
+            windows = ()
+            offpeak = record.weekday_offpeak_cost
+            band_rates = {
+                "peak": record.weekday_peak_cost,
+                "shoulder": _first(record.weekday_shoulder_cost, offpeak),
+                "offpeak": offpeak,
+                "weekend_offpeak": _first(record.weekend_offpeak_cost, offpeak),
+            }
+        return cls(
+            name,
+            record.supply_charge or 0.0,
+            windows,
+            band_rates,
+            record.controlled_load_cost,
+            record.generation_cost or 0.0,
+        )
+
+    def _window_rates(self, weekday, hours):
+        """Return the rate of each interval starting at ``hours`` o'clock."""
+        key = (weekday, hours.tobytes())
+        rates = self._rates.get(key)
+        if rates is None:
+            rates = np.full(len(hours), np.nan)
+            # Later windows first, so that earlier ones win where they overlap.
+            for window in reversed(self.windows):
+                if weekday in window.days:
+                    covered = (hours >= window.start) & (hours < window.end)
+                    rates[covered] = window.rate
+            if np.isnan(rates).any():
+                raise ValueError(
+                    "Tariff {} has no rate at {:g}h on weekday {}".format(
+                        self.name, hours[np.isnan(rates)][0], weekday
+                    )
+                )
+            self._rates[key] = rates
+        return rates
+
+    def usage_cost(self, day, readings):
+        """Return the cost of a day's usage other than controlled load.
+
+        ``readings`` holds a row of interval readings per channel, in the
+        order of ``CONSUMPTION_KEYS``, NaN where missing.
+        """
+        if self.band_rates is not None:
+            weekend = day.weekday() in WEEKENDS
+            offpeak = self.band_rates["weekend_offpeak" if weekend else "offpeak"]
+            return (
+                np.nansum(readings[_PEAK]) * self.band_rates["peak"]
+                + np.nansum(readings[_SHOULDER]) * self.band_rates["shoulder"]
+                + np.nansum(readings[_OFFPEAK]) * offpeak
+            )
+
+        usage = np.nansum(readings[[_PEAK, _OFFPEAK, _SHOULDER]], axis=0)
+        rates = self._window_rates(day.weekday(), interval_hours(day, len(usage)))
+        return float(np.dot(usage, rates))
+
+    def controlled_load_cost(self, day, readings):
+        if self.controlled_load_rate is not None:
+            return np.nansum(readings[_CONTROLLED_LOAD]) * self.controlled_load_rate
+
+        # Priced like any other usage, under the windows or as off peak.
+        controlled = np.zeros_like(readings)
+        controlled[_OFFPEAK] = readings[_CONTROLLED_LOAD]
+        return self.usage_cost(day, controlled)
+
+
+class CostBreakdown(object):
+    """What a range of days cost, or would have cost, under one tariff.
+
+    Costs are in dollars, energy in kWh. ``generation_credit`` is negative
+    and included in ``total``.
+    """
+
+    __slots__ = (
+        "tariff",
+        "days",
+        "consumption",
+        "generation",
+        "supply",
+        "usage",
+        "controlled_load",
+        "generation_credit",
+    )
+
+    def __init__(self, tariff):
+        """Initialize an empty breakdown."""
+        self.tariff = tariff
+        self.days = 0
+        self.consumption = 0.0
+        self.generation = 0.0
+        self.supply = 0.0
+        self.usage = 0.0
+        self.controlled_load = 0.0
+        self.generation_credit = 0.0
+
+    @property
+    def total(self):
+        return self.supply + self.usage + self.controlled_load + self.generation_credit
+
+    def as_dict(self):
+        """Return the breakdown rounded to cents and Wh."""
+        return {
+            "tariff": self.tariff,
+            "days": self.days,
+            "consumption": round(self.consumption, 3),
+            "generation": round(self.generation, 3),
+            "supply": round(self.supply, 2),
+            "usage": round(self.usage, 2),
+            "controlled_load": round(self.controlled_load, 2),
+            "generation_credit": round(self.generation_credit, 2),
+            "total": round(self.total, 2),
+        }
+
+
+def interval_hours(day, intervals):
+    """Return the local time, in hours, at which each interval of a day starts.
+
+    As in ``statistics.hourly_values``, a day's intervals share its length
+    evenly, so the hours skip or repeat at daylight saving changes.
+    """
+    tz = ZoneInfo(PORTAL_TIMEZONE)
+    utc = ZoneInfo("UTC")
+    start = datetime.combine(day, time(), tzinfo=tz).astimezone(utc)
+    end = datetime.combine(day + timedelta(days=1), time(), tzinfo=tz).astimezone(utc)
+    step = (end - start) / intervals
+    if end - start == timedelta(hours=24):
+        return np.arange(intervals) * (24 / intervals)
+
+    hours = []
+    for index in range(intervals):
+        local = (start + step * index).astimezone(tz)
+        hours.append(local.hour + local.minute / 60 + local.second / 3600)
+    return np.array(hours)
+
+
+def price_days(tariffs, days):
+    """Price every day under each tariff.
+
+    ``days`` maps ``datetime.date`` to that day's ``consumptionData`` dict.
+    Returns a ``CostBreakdown`` per tariff, cheapest first.
+    """
+    breakdowns = [CostBreakdown(tariff.name) for tariff in tariffs]
+
+    for day, consumption in sorted(days.items()):
+        readings = np.array(
+            [
+                [np.nan if v is None else v for v in consumption[key]]
+                for key in CONSUMPTION_KEYS[:5]
+            ],
+            dtype=float,
+        )
+        usage = float(np.nansum(readings[:_GENERATION]))
+        generation = float(np.nansum(readings[_GENERATION]))
+
+        for tariff, breakdown in zip(tariffs, breakdowns):
+            breakdown.days += 1
+            breakdown.consumption += usage
+            breakdown.generation += generation
+            breakdown.supply += tariff.supply_charge
+            breakdown.usage += float(tariff.usage_cost(day, readings))
+            breakdown.controlled_load += float(
+                tariff.controlled_load_cost(day, readings)
+            )
+            breakdown.generation_credit -= generation * tariff.generation_rate
+
+    return sorted(breakdowns, key=lambda breakdown: breakdown.total)
+
+
+def _first(*values):
+    return next((v for v in values if v is not None), None)
@@ -0,0 +1,62 @@
+"""Opt-in tracing of the responses the Jemena Outlook portal sends back."""
+import json
+import logging
+import random
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_MAX_BYTES = 2048
+
+
+def _log(line):
+    # Switching tracing on asks for the trace lines, so they skip the
+    # logger's own level check, which stays with the logger config.
+    # Handlers and filters still apply as to any other record.
+    if not _LOGGER.disabled:
+        _LOGGER.handle(
+            _LOGGER.makeRecord(_LOGGER.name, logging.INFO, __file__, 0, line, (), None)
+        )
+
+
+class Tracer(object):
+    """Log one json line per portal response of an account while enabled.
+
+    Callers check ``enabled`` before building anything to trace, so a
+    disabled tracer costs one attribute lookup. A ``sample_rate`` share of
+    the responses also get their body logged, cut to ``max_bytes``.
+    """
+
+    def __init__(self, account):
+        """Initialize a disabled tracer for an account."""
+        self.account = account
+        self.enabled = False
+        self.sample_rate = DEFAULT_SAMPLE_RATE
+        self.max_bytes = DEFAULT_MAX_BYTES
+
+    def configure(
+        self, enabled, sample_rate=DEFAULT_SAMPLE_RATE, max_bytes=DEFAULT_MAX_BYTES
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+
+    def response(self, method, url, status, body=None, cached=False, size=None):
+        """Trace a response, ``body`` is None when it was not read.
+
+        ``size`` is the body's length when ``body`` is only its start.
+        """
+        if size is None and body is not None:
+            size = len(body)
+        event = {
+            "account": self.account,
+            "method": method,
+            "url": str(url),
+            "status": status,
+            "bytes": size,
+            "cached": cached,
+        }
+        if body and random.random() < self.sample_rate:
+            event["payload"] = body[: self.max_bytes].decode("utf-8", "replace")
+            event["truncated"] = size > self.max_bytes
+        _log(json.dumps(event))
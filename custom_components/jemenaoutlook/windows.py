@@ -0,0 +1,206 @@
+"""
+Rolling windows over the days kept in the interval store.
+
+Each stored day is summarised once, to its consumption, cost and busiest
+hour, and pushed into every window in date order. A window keeps running
+sums of its days and drops the days that fall out of it as newer ones
+arrive, so a day costs the same constant work however long the windows are
+and however many there are, and no window needs anything from the portal
+beyond the day views already fetched.
+"""
+from collections import deque
+from datetime import timedelta
+
+from .const import CONSUMPTION_KEYS, COST_KEYS
+from .statistics import hourly_values
+
+# Channels counted as consumption, as in ``PeriodRecord.consumption``.
+_CONSUMPTION_KEYS = CONSUMPTION_KEYS[:4]
+
+
+class DaySummary(object):
+    """What one stored day adds to a window.
+
+    ``consumption`` excludes generation, ``cost`` is the day's total cost
+    including the generation credit, and ``peak_hour`` is the consumption
+    of the day's busiest hour, None if it had no readings.
+    """
+
+    __slots__ = ("day", "consumption", "cost", "peak_hour")
+
+    def __init__(self, day, consumption, cost, peak_hour):
+        """Initialize the summary."""
+        self.day = day
+        self.consumption = consumption
+        self.cost = cost
+        self.peak_hour = peak_hour
+
+
+def summarize_day(day, period):
+    """Summarise a stored day's period, as returned by ``IntervalStore``."""
+    consumption = period["consumptionData"]
+    intervals = []
+    for values in zip(*(consumption[key] for key in _CONSUMPTION_KEYS)):
+        readings = [v for v in values if v is not None]
+        intervals.append(sum(readings) if readings else None)
+
+    hours = hourly_values(day, intervals)
+    cost = sum(v for key in COST_KEYS for v in period["costData"][key] if v is not None)
+    return DaySummary(
+        day,
+        sum(v for v in intervals if v is not None),
+        cost,
+        max((kwh for _, kwh in hours), default=None),
+    )
+
+
+def summarize_days(days):
+    """Summarise ``IntervalStore.get_days`` results, in date order."""
+    return [summarize_day(day, period) for day, (period, _) in sorted(days.items())]
+
+
+class RollingWindow(object):
+    """Running sums over the last ``days`` days up to the latest day pushed.
+
+    Days missing from the store simply do not count, ``count`` says how
+    many of the window's days were stored.
+    """
+
+    def __init__(self, days):
+        """Initialize an empty window."""
+        self.days = days
+        self._days = deque()
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.consumption = 0.0
+        self.cost = 0.0
+        self.peak_hour_days = 0
+        self.peak_hour = 0.0
+
+    def _add(self, summary, sign):
+        self.count += sign
+        self.consumption += sign * summary.consumption
+        self.cost += sign * summary.cost
+        if summary.peak_hour is not None:
+            self.peak_hour_days += sign
+            self.peak_hour += sign * summary.peak_hour
+
+    def advance(self, day):
+        """Move the end of the window to ``day``, dropping the days before it."""
+        oldest = day - timedelta(days=self.days - 1)
+        while self._days and self._days[0].day < oldest:
+            self._add(self._days.popleft(), -1)
+        # Rounding errors left over from removed days go with the last of them.
+        if not self._days:
+            self._reset()
+
+    def push(self, summary):
+        """Add the day after the latest one pushed, or any later day."""
+        self.advance(summary.day)
+        self._days.append(summary)
+        self._add(summary, 1)
+
+    def values(self, prefix):
+        """Return the window's sensor values, keyed ``prefix`` + field."""
+        if not self.count:
+            return {}
+        values = {
+            prefix + "consumption": round(self.consumption, 3),
+            prefix + "cost_total": round(self.cost, 2),
+            prefix + "daily_average": round(self.consumption / self.count, 3),
+        }
+        if self.peak_hour_days:
+            values[prefix + "peak_hour_average"] = round(
+                self.peak_hour / self.peak_hour_days, 3
+            )
+        return values
+
+
+class WeekdayBaseline(object):
+    """Average consumption on the same weekday over the previous ``weeks`` weeks.
+
+    The baseline of the latest day pushed is taken before that day is
+    added, so the day can be compared against it.
+    """
+
+    def __init__(self, weeks):
+        """Initialize with no days."""
+        self.weeks = weeks
+        self._weekdays = [RollingWindow(weeks * 7) for _ in range(7)]
+        self.value = None
+
+    def push(self, summary):
+        """Take the baseline of the next day, then add the day."""
+        window = self._weekdays[summary.day.weekday()]
+        window.advance(summary.day - timedelta(days=1))
+        self.value = window.values("").get("daily_average")
+        window.push(summary)
+
+
+def window_prefix(days):
+    """Return the start of the sensor keys of the ``days`` long window."""
+    return "last_{}_days_".format(days)
+
+
+class RollingWindows(object):
+    """An account's rolling windows and its same weekday baseline.
+
+    ``lengths`` are the windows' lengths in days. Days are pushed in date
+    order; ``last_day`` is the latest one pushed. The windows only report
+    values while ``last_day`` is no older than the latest day due, see
+    ``expect``.
+    """
+
+    def __init__(self, lengths, baseline_weeks):
+        """Initialize the windows with no days."""
+        self.lengths = tuple(sorted(lengths))
+        self._windows = [RollingWindow(days) for days in self.lengths]
+        self.baseline = WeekdayBaseline(baseline_weeks)
+        self.last_day = None
+        self.expected_day = None
+        self._values = {}
+
+    @property
+    def span(self):
+        """Return how many days back the windows and the baseline reach."""
+        return max(self.lengths + (self.baseline.weeks * 7 + 1,))
+
+    def push(self, summary):
+        """Add the next stored day to every window."""
+        if self.last_day is not None and summary.day <= self.last_day:
+            raise ValueError(
+                "Day {} is not after {}".format(summary.day, self.last_day)
+            )
+        for window in self._windows:
+            window.push(summary)
+        self.baseline.push(summary)
+        self.last_day = summary.day
+        self._values = None
+
+    def expect(self, day):
+        """Set the latest day that should have been pushed by now.
+
+        Once the stored days stop, the windows would go on ending at the
+        last one, so they report nothing while ``day`` is missing instead.
+        """
+        self.expected_day = day
+
+    def values(self):
+        """Return every window's sensor values by key, as of ``last_day``.
+
+        Nothing is returned while the windows end before the expected day.
+        """
+        if self.expected_day is not None and (
+            self.last_day is None or self.last_day < self.expected_day
+        ):
+            return {}
+        if self._values is None:
+            values = {}
+            for window in self._windows:
+                values.update(window.values(window_prefix(window.days)))
+            if self.baseline.value is not None:
+                values["same_weekday_baseline"] = self.baseline.value
+            self._values = values
+        return self._values
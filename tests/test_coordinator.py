@@ -0,0 +1,69 @@
+"""Tests of the refreshes planned around the portal's publication of a day."""
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.jemenaoutlook import coordinator as coordinator_module
+from custom_components.jemenaoutlook.client import JemenaOutlookUnavailable
+from custom_components.jemenaoutlook.const import ENDPOINTS
+from custom_components.jemenaoutlook.coordinator import JemenaOutlookData
+from custom_components.jemenaoutlook.models import OutlookData
+
+COMPLETE_DAY = {
+    "selectedPeriod": {
+        "consumptionData": {"peak": [0.5] * 48},
+        "costData": {"peak": [0.1] * 48},
+    }
+}
+
+
+def test_failed_fetch_of_new_day_is_retried(tmp_path, monkeypatch):
+    """A new day whose full fetch failed is fetched and imported at the next probe."""
+    fetches = []
+    imports = []
+
+    async def fetch_day_json(days_ago):
+        return COMPLETE_DAY
+
+    async def fetch_data():
+        fetches.append(len(fetches))
+        if len(fetches) == 1:
+            raise JemenaOutlookUnavailable("portal down")
+
+    async def import_new_days(hass, account, name, store):
+        imports.append(account)
+
+    monkeypatch.setattr(coordinator_module, "is_complete", lambda period: True)
+    monkeypatch.setattr(coordinator_module, "async_import_new_days", import_new_days)
+
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = JemenaOutlookData(
+            hass, None, "user@example.com", "secret", "Home", endpoints=ENDPOINTS
+        )
+        coordinator.client.fetch_day_json = fetch_day_json
+        coordinator.client.fetch_data = fetch_data
+        # Data from an earlier day is already shown.
+        coordinator.data = OutlookData()
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        assert fetches == [0]
+        assert imports == []
+
+        await coordinator._async_update_data()
+        assert fetches == [0, 1]
+        assert imports == ["user@example.com"]
+
+        # Nothing changed since, so the next probe fetches nothing.
+        await coordinator._async_update_data()
+        assert fetches == [0, 1]
+        assert imports == ["user@example.com"]
+
+        await coordinator.client.store.async_close()
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+"""Tests of the streaming selective json decoder."""
+import asyncio
+import json
+import os
+from json import JSONDecodeError
+
+import pytest
+
+from custom_components.jemenaoutlook.client import PERIOD_VIEW_FIELDS
+from custom_components.jemenaoutlook.jsonstream import decode_stream
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fixtures")
+
+
+async def _chunks(data, size):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _decode(data, fields, size):
+    return asyncio.run(decode_stream(_chunks(data, size), fields))
+
+
+def _select(document, fields):
+    if not isinstance(document, dict):
+        return document
+    return {
+        key: document[key] if nested is None else _select(document[key], nested)
+        for key, nested in fields.items()
+        if key in document
+    }
+
+
+@pytest.mark.parametrize("view", ["day", "week", "month", "season"])
+@pytest.mark.parametrize("size", [1, 7, 64, 8192])
+def test_period_view_matches_json_loads(view, size):
+    with open(os.path.join(FIXTURES, "period_{}.json".format(view)), "rb") as f:
+        data = f.read()
+
+    expected = _select(json.loads(data), PERIOD_VIEW_FIELDS)
+    assert _decode(data, PERIOD_VIEW_FIELDS, size) == expected
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 100])
+def test_skipped_members_may_hold_any_json(size):
+    document = {
+        "skip": ['a]b}c{"', "\\", {"x": [1, {"y": "}}"}]}, "é\U0001F600", None],
+        "keep": {"inner": 'q"]}', "drop": ["[["], "n": [None, 1.25]},
+        "value": -1.5e3,
+    }
+    fields = {"keep": {"inner": None, "n": None}, "value": None}
+    for encoding in ("utf-8", "utf-16"):
+        data = json.dumps(document, ensure_ascii=False).encode(encoding)
+        assert _decode(data, fields, size) == {
+            "keep": {"inner": 'q"]}', "n": [None, 1.25]},
+            "value": -1.5e3,
+        }
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"<html></html>", b"[1]", b'{"a": 1', b'{"a": 1} x', b'{"a": tru}']
+)
+def test_not_a_json_object(data):
+    with pytest.raises(JSONDecodeError):
+        _decode(data, {"a": None}, 3)
@@ -0,0 +1,32 @@
+"""Tests of the rolling windows kept from the stored days."""
+from datetime import date, timedelta
+
+from custom_components.jemenaoutlook.windows import DaySummary, RollingWindows
+
+START = date(2024, 3, 1)
+
+
+def _windows(days):
+    windows = RollingWindows((7,), 1)
+    for offset in range(days):
+        windows.push(DaySummary(START + timedelta(days=offset), 10.0, 2.0, 1.0))
+    return windows
+
+
+def test_windows_end_at_the_expected_day():
+    windows = _windows(10)
+    windows.expect(START + timedelta(days=9))
+
+    values = windows.values()
+    assert values["last_7_days_consumption"] == 70.0
+    assert values["last_7_days_daily_average"] == 10.0
+    assert values["same_weekday_baseline"] == 10.0
+
+
+def test_no_values_once_the_stored_days_stop():
+    windows = _windows(10)
+    windows.expect(START + timedelta(days=12))
+    assert windows.values() == {}
+
+    windows.push(DaySummary(START + timedelta(days=12), 4.0, 1.0, 1.0))
+    assert windows.values()["last_7_days_consumption"] == 44.0